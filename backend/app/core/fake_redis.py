@@ -55,6 +55,15 @@ class FakeRedisPipeline:
     def delete(self, *keys: str):
         return self._add("delete", *keys)
 
+    def hset(self, key: str, mapping: dict | None = None, **kwargs):
+        return self._add("hset", key, mapping, **kwargs)
+
+    def expire(self, key: str, seconds: SecondsLike):
+        return self._add("expire", key, seconds)
+
+    def hgetall(self, key: str):
+        return self._add("hgetall", key)
+
     def smembers(self, key: str):
         return self._add("smembers", key)
 
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -19,7 +21,9 @@ profile_router = APIRouter(
 
 @profile_router.get("/avatar", summary="获取当前用户头像")
 async def get_avatar(current_user: User = Depends(require_user)):
-    target, media_type = ProfileService.resolve_avatar_file(current_user.avatar_path)
+    target, media_type = await asyncio.to_thread(
+        ProfileService.resolve_avatar_file, current_user.avatar_path
+    )
     if not target:
         raise HTTPException(status_code=404, detail="头像不存在")
     return FileResponse(path=target, media_type=media_type)
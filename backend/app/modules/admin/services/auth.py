@@ -502,11 +502,24 @@ class AuthService:
     @classmethod
     async def get_current_user(
         cls,
+        request: Request,
         token: Annotated[str, Depends(oauth2_scheme)],
         db: AsyncSession = Depends(get_async_session),
         redis: aioredis.Redis = Depends(get_async_redis),
     ):
-        return await cls._get_user_from_token(token, db, redis)
+        """
+        解析当前请求的登录用户。
+        结果缓存在 request.state 上：require_user 与带 scopes 的权限依赖
+        在 FastAPI 中缓存键不同，会各自解析一次依赖链，
+        请求级缓存保证 Token 校验与用户查询每个请求只执行一次。
+        返回：当前用户。
+        """
+        cached = getattr(request.state, "current_user", None)
+        if cached is not None:
+            return cached
+        user = await cls._get_user_from_token(token, db, redis)
+        request.state.current_user = user
+        return user
 
     @classmethod
     @audited(
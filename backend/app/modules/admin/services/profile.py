@@ -12,6 +12,9 @@ from app.core.config import settings
 from app.core.exception import ServiceException
 from app.modules.admin.models.user import User
 
+# 静态资源根目录在进程内固定，导入时只解析一次；目录由上传头像时按需创建
+_STATIC_ROOT = (Path.cwd() / "app" / "static").resolve()
+
 
 class ProfileService:
     ALLOWED_MIME = {"image/png", "image/jpeg", "image/webp"}
@@ -64,8 +67,7 @@ class ProfileService:
         static_root = cls._static_root()
         target = (static_root / clean).resolve()
         cls._ensure_under_root(target, static_root)
-        if target.exists() and target.is_file():
-            await asyncio.to_thread(target.unlink, True)
+        await asyncio.to_thread(cls._unlink_file, target)
 
     @classmethod
     def resolve_avatar_file(cls, avatar_path: str | None) -> tuple[Path | None, str | None]:
@@ -82,6 +84,11 @@ class ProfileService:
         content_type, _ = mimetypes.guess_type(str(target))
         return target, content_type or "application/octet-stream"
 
+    @staticmethod
+    def _unlink_file(target: Path) -> None:
+        if target.is_file():
+            target.unlink(missing_ok=True)
+
     @staticmethod
     def _suffix_from_mime(mime: str) -> str:
         mapping = {
@@ -93,9 +100,7 @@ class ProfileService:
 
     @staticmethod
     def _static_root() -> Path:
-        root = (Path.cwd() / "app" / "static").resolve()
-        root.mkdir(parents=True, exist_ok=True)
-        return root
+        return _STATIC_ROOT
 
     @staticmethod
     def _ensure_under_root(target: Path, root: Path) -> None:
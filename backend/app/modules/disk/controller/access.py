@@ -93,6 +93,7 @@ async def issue_office_url(
     return ResponseModel.success(data=data)
 
 
+@access_router.head("/{file_id}/download", summary="下载文件元信息(下载令牌)")
 @access_router.get("/{file_id}/download", summary="下载文件(下载令牌)")
 async def download_by_token(
     request: Request,
@@ -110,6 +111,7 @@ async def download_by_token(
     )
 
 
+@access_router.head("/{file_id}/preview", summary="预览文件元信息(预览令牌)")
 @access_router.get("/{file_id}/preview", summary="预览文件(预览令牌)")
 async def preview_by_token(
     request: Request,
@@ -6,7 +6,9 @@
 @Description: 压缩/解压新接口
 """
 
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
 
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
@@ -96,7 +98,12 @@ async def compress_status(
     """
     status = await FileService.get_compress_job_status(job_id, current_user.id, redis)
     await _refresh_usage_if_needed(
-        status, current_user.id, f"disk:compress:{job_id}", redis, db
+        status,
+        current_user.id,
+        "compress",
+        job_id,
+        redis,
+        db,
     )
     return ResponseModel.success(
         data={"status": status.get("status"), "message": status.get("message", "")}
@@ -153,20 +160,66 @@ async def extract_status(
     """
     status = await FileService.get_extract_job_status(job_id, current_user.id, redis)
     await _refresh_usage_if_needed(
-        status, current_user.id, f"disk:extract:{job_id}", redis, db
+        status,
+        current_user.id,
+        "extract",
+        job_id,
+        redis,
+        db,
     )
     return ResponseModel.success(
         data={"status": status.get("status"), "message": status.get("message", "")}
     )
 
 
+@archives_router.get(
+    "/status/batch",
+    summary="批量查询压缩/解压任务状态",
+    dependencies=[require_permissions(["disk:archive:status"])],
+)
+async def batch_status(
+    kind: Literal["compress", "extract"],
+    job_ids: list[str] = Query(..., max_length=100),
+    current_user: User = Depends(require_user),
+    redis=Depends(get_async_redis),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    批量查询同类任务状态，供前端同时轮询多个任务。
+    仅返回当前用户的任务，不存在的 job_id 会被忽略。
+    就绪任务同样会刷新用户已用空间。
+    性能：所有任务状态合并为一次 Redis pipeline 读取。
+    返回：job_id -> status 与 message。
+    """
+    statuses = await FileService.get_jobs_status(
+        kind, job_ids, current_user.id, redis
+    )
+    for job_id, status in statuses.items():
+        await _refresh_usage_if_needed(
+            status,
+            current_user.id,
+            kind,
+            job_id,
+            redis,
+            db,
+        )
+    return ResponseModel.success(
+        data={
+            job_id: {
+                "status": status.get("status"),
+                "message": status.get("message", ""),
+            }
+            for job_id, status in statuses.items()
+        }
+    )
+
+
 async def _refresh_usage_if_needed(
-    status: dict, user_id: int, job_key: str, redis, db: AsyncSession
+    status: dict, user_id: int, kind: str, job_id: str, redis, db: AsyncSession
 ) -> None:
     if status.get("status") == "ready" and status.get("usage_updated") != "1":
-        await FileService.refresh_used_space(db, user_id)
-        await redis.hset(job_key, mapping={"usage_updated": "1"})
-        await redis.expire(job_key, 10800)
+        await FileService.schedule_used_space_refresh(db, user_id, redis)
+        await FileService.mark_job_usage_updated(kind, job_id, redis)
         status["usage_updated"] = "1"
 
 
@@ -6,12 +6,20 @@
 @Description: 文件/目录相关新接口
 """
 
+from datetime import datetime
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
-from app.shared.deps import require_permissions, require_user
-from app.core.database import get_async_session
+from app.shared.deps import (
+    json_body,
+    json_body_openapi,
+    require_permissions,
+    require_user,
+)
+from app.core.database import get_async_redis, get_async_session
 from app.core.exception import ServiceException
 from app.modules.disk.domain.paths import rel_path_from_storage
 from app.modules.disk.schemas.disk import (
@@ -26,6 +34,7 @@ from app.modules.disk.schemas.disk import (
     FileUpdateBody,
 )
 from app.modules.disk.services.file import FileService
+from app.modules.disk.services.share import ShareService
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 files_router = APIRouter(
@@ -34,6 +43,9 @@ files_router = APIRouter(
     dependencies=[Depends(require_user)],
 )
 
+_MKDIR_BODY = json_body(FileMkdirIn)
+_DELETE_BODY = json_body(FileDeleteIn)
+
 
 @files_router.get(
     "",
@@ -153,9 +165,10 @@ async def get_file(
     summary="创建目录",
     response_model=ResponseModel[FileEntryOut],
     dependencies=[require_permissions(["disk:file:mkdir"])],
+    openapi_extra=json_body_openapi(FileMkdirIn),
 )
 async def create_dir(
-    data: FileMkdirIn,
+    data: FileMkdirIn = Depends(_MKDIR_BODY),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -191,6 +204,7 @@ async def upload_file(
     overwrite: bool = Form(False),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     直传文件入口（非分片）。
@@ -216,7 +230,10 @@ async def upload_file(
             commit=False,
         )
         items.append(_to_file_entry(entry))
-    await FileService.refresh_used_space(db, current_user.id)
+    if overwrite:
+        # 覆盖会把同名旧文件移入回收站
+        await ShareService.invalidate_deleted_targets(current_user.id, db, redis)
+    await FileService.schedule_used_space_refresh(db, current_user.id, redis)
     return ResponseModel.success(data=FileUploadOut(items=items))
 
 
@@ -261,11 +278,13 @@ async def update_file(
     summary="删除文件或目录(进入回收站)",
     response_model=ResponseModel[FileDeleteBatchOut],
     dependencies=[require_permissions(["disk:file:delete"])],
+    openapi_extra=json_body_openapi(FileDeleteIn),
 )
 async def delete_files(
-    data: FileDeleteIn,
+    data: FileDeleteIn = Depends(_DELETE_BODY),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     批量删除文件或目录，进入回收站。
@@ -290,7 +309,8 @@ async def delete_files(
         except Exception:
             failed.append(FileDeleteFailure(file_id=file_id, error="删除失败"))
     if success:
-        await FileService.refresh_used_space(db, current_user.id)
+        await ShareService.invalidate_deleted_targets(current_user.id, db, redis)
+        await FileService.schedule_used_space_refresh(db, current_user.id, redis)
     return ResponseModel.success(
         data=FileDeleteBatchOut(success=success, failed=failed)
     )
@@ -403,19 +423,48 @@ async def save_text(
 
 
 def _to_file_entry(entry) -> FileEntryOut:
-    rel_path = rel_path_from_storage(entry.user_id, entry.storage_path)
+    # 以全部输出字段为键复用冻结模型，未变化的条目重复列出时跳过 Pydantic 校验
+    return _build_file_entry(
+        entry.id,
+        entry.user_id,
+        entry.parent_id,
+        entry.name,
+        entry.storage_path,
+        entry.is_dir,
+        entry.size,
+        entry.mime_type,
+        entry.etag,
+        entry.created_at,
+        entry.updated_at,
+    )
+
+
+@lru_cache(maxsize=16384)
+def _build_file_entry(
+    id: int,
+    user_id: int,
+    parent_id: int | None,
+    name: str,
+    storage_path: str,
+    is_dir: bool,
+    size: int,
+    mime_type: str | None,
+    etag: str,
+    created_at: datetime | None,
+    updated_at: datetime | None,
+) -> FileEntryOut:
     return FileEntryOut(
-        id=entry.id,
-        user_id=entry.user_id,
-        parent_id=entry.parent_id,
-        name=entry.name,
-        path=rel_path,
-        is_dir=entry.is_dir,
-        size=entry.size,
-        mime_type=entry.mime_type,
-        etag=entry.etag,
-        created_at=entry.created_at,
-        updated_at=entry.updated_at,
+        id=id,
+        user_id=user_id,
+        parent_id=parent_id,
+        name=name,
+        path=rel_path_from_storage(user_id, storage_path),
+        is_dir=is_dir,
+        size=size,
+        mime_type=mime_type,
+        etag=etag,
+        created_at=created_at,
+        updated_at=updated_at,
     )
 
 
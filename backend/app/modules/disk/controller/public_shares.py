@@ -6,23 +6,33 @@
 @Description: 公开分享新接口
 """
 
+import json
 import re
+import time
 from datetime import datetime
+from functools import lru_cache
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
 from app.shared.deps import require_user
 from app.core.database import get_async_redis, get_async_session
 from app.core.exception import ServiceException
-from app.modules.disk.schemas.share import ShareSaveIn, ShareUnlockIn
+from app.modules.disk.schemas.share import (
+    ShareListQueryOut,
+    ShareSaveIn,
+    ShareUnlockIn,
+)
 from app.modules.disk.services.file import FileService
 from app.modules.disk.services.share import ShareService
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 public_shares_router = APIRouter(prefix="/shares", tags=["Disk - Public Share"])
 
+_BEARER_RE = re.compile(r"Bearer\s+(.+)", re.IGNORECASE)
+_DEFAULT_UNLOCK_TTL = 86400 * 7
+
 
 def _get_access_token(request: Request) -> str | None:
     query_token = request.query_params.get("accessToken")
@@ -31,13 +41,106 @@ def _get_access_token(request: Request) -> str | None:
     auth = request.headers.get("authorization")
     if not auth:
         return None
-    match = re.match(r"Bearer\s+(.+)", auth, re.IGNORECASE)
+    if len(auth) > 7 and auth[:7].lower() == "bearer ":
+        return auth[7:].strip() or None
+    match = _BEARER_RE.match(auth)
     if not match:
         return None
     return match.group(1)
 
 
-@public_shares_router.get("/{token}", summary="获取公开分享")
+async def _require_share_access(
+    token: str,
+    request: Request,
+    redis=Depends(get_async_redis),
+    db: AsyncSession = Depends(get_async_session),
+) -> tuple[int, dict]:
+    """
+    依赖注入：解析分享并校验提取码访问 token。
+    redis/db 与路由共享同一请求内的依赖缓存。
+    分享解析缓存与访问 token 用一次 MGET 取回，缓存命中时仅一次 Redis 往返；
+    解析缓存缺失时回退 resolve_share 查 DB。
+    错误：需要提取码但未解锁时抛出 ServiceException。
+    返回：(owner_id, share)。
+    """
+    access_token = _get_access_token(request)
+    resolved = ShareService.get_local_resolved(token)
+    if resolved is not None:
+        # 进程内命中：无需提取码时零 Redis 往返。
+        user_id, share = resolved
+        if share.get("hasCode"):
+            if not access_token or not await redis.get(
+                ShareService.share_access_key(token, access_token)
+            ):
+                raise ServiceException(msg="需要提取码")
+        return user_id, share
+    keys = [ShareService.share_resolve_key(token)]
+    if access_token:
+        keys.append(ShareService.share_access_key(token, access_token))
+    values = await redis.mget(keys)
+    resolved = ShareService.decode_resolved_cache(values[0])
+    if resolved is None:
+        resolved = await ShareService.resolve_share(token, db, redis=redis)
+    else:
+        ShareService.set_local_resolved(token, resolved)
+    user_id, share = resolved
+    if share.get("hasCode"):
+        if not access_token or not values[1]:
+            raise ServiceException(msg="需要提取码")
+    return user_id, share
+
+
+@lru_cache(maxsize=4096)
+def _locked_share_json(
+    name: str | None,
+    resource_type: str | None,
+    expires_at: int | None,
+    owner_name: str | None,
+) -> bytes:
+    return json.dumps(
+        {
+            "name": name,
+            "resourceType": resource_type,
+            "expiresAt": expires_at,
+            "ownerName": owner_name,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _locked_response(share: dict) -> Response:
+    """
+    未解锁分享的响应。
+    锁定态只暴露固定字段，序列化结果按字段值缓存，
+    直接拼接字节返回，跳过 ResponseModel 校验与序列化；
+    字段值变化（如修改过期时间）自然落到新的缓存项。
+    返回：与 ResponseModel.success 相同结构的 JSON 响应。
+    """
+    share_json = _locked_share_json(
+        share.get("name"),
+        share.get("resourceType"),
+        share.get("expiresAt"),
+        share.get("ownerName"),
+    )
+    now = datetime.now().isoformat().encode("ascii")
+    return Response(
+        content=(
+            b'{"code":200,"msg":"Success","data":{"locked":true,"share":'
+            + share_json
+            + b'},"time":"'
+            + now
+            + b'"}'
+        ),
+        media_type="application/json",
+    )
+
+
+@public_shares_router.get(
+    "/{token}",
+    summary="获取公开分享",
+    response_model=ResponseModel[dict],
+)
 async def get_public_share(
     token: str,
     request: Request,
@@ -54,36 +157,16 @@ async def get_public_share(
     性能：单次 DB 查询 + Redis 校验。
     返回：分享信息与锁定状态。
     """
-    user_id, share = await ShareService.resolve_share(token, db)
+    user_id, share = await ShareService.resolve_share(token, db, redis=redis)
     if share.get("hasCode"):
         access_token = _get_access_token(request)
         if access_token:
             key = ShareService.share_access_key(token, access_token)
             ok = await redis.get(key)
             if not ok:
-                return ResponseModel.success(
-                    data={
-                        "locked": True,
-                        "share": {
-                            "name": share.get("name"),
-                            "resourceType": share.get("resourceType"),
-                            "expiresAt": share.get("expiresAt"),
-                            "ownerName": share.get("ownerName"),
-                        },
-                    }
-                )
+                return _locked_response(share)
         else:
-            return ResponseModel.success(
-                data={
-                    "locked": True,
-                    "share": {
-                        "name": share.get("name"),
-                        "resourceType": share.get("resourceType"),
-                        "expiresAt": share.get("expiresAt"),
-                        "ownerName": share.get("ownerName"),
-                    },
-                }
-            )
+            return _locked_response(share)
     share_public = dict(share)
     share_public.pop("code", None)
     file_meta = await ShareService.get_share_file_meta(share, user_id, db)
@@ -92,7 +175,11 @@ async def get_public_share(
     )
 
 
-@public_shares_router.post("/{token}/unlock", summary="解锁分享")
+@public_shares_router.post(
+    "/{token}/unlock",
+    summary="解锁分享",
+    response_model=ResponseModel[dict],
+)
 async def unlock_share(
     token: str,
     data: ShareUnlockIn,
@@ -109,31 +196,31 @@ async def unlock_share(
     错误：提取码不匹配则返回错误。
     返回：accessToken 或 ok。
     """
-    user_id, share = await ShareService.resolve_share(token, db)
+    user_id, share = await ShareService.resolve_share(token, db, redis=redis)
     if not share.get("hasCode"):
         return ResponseModel.success(data={"ok": True})
     if data.code != share.get("code"):
         raise ServiceException(msg="提取码错误")
     access_token = uuid4().hex
-    ttl = 86400 * 7
+    ttl = _DEFAULT_UNLOCK_TTL
     expires_at = share.get("expiresAt")
     if expires_at:
-        ttl = max(
-            int((int(expires_at) - ShareService._to_ms(datetime.now())) / 1000),
-            60,
-        )
+        ttl = max((int(expires_at) - time.time_ns() // 1_000_000) // 1000, 60)
     await redis.set(ShareService.share_access_key(token, access_token), "1", ex=ttl)
     return ResponseModel.success(data={"accessToken": access_token})
 
 
-@public_shares_router.get("/{token}/entries", summary="分享目录列表")
+@public_shares_router.get(
+    "/{token}/entries",
+    summary="分享目录列表",
+    response_model=ResponseModel[ShareListQueryOut],
+)
 async def list_share_entries(
     token: str,
-    request: Request,
     parent_id: int | None = None,
     cursor: str | None = None,
     limit: int = 50,
-    redis=Depends(get_async_redis),
+    auth: tuple[int, dict] = Depends(_require_share_access),
     db: AsyncSession = Depends(get_async_session),
 ):
     """
@@ -142,33 +229,28 @@ async def list_share_entries(
     若分享设置提取码需先解锁。
     仅允许在分享范围内访问内容。
     幂等：同参数返回一致结果。
-    性能：先拉取全量后再裁剪。
+    性能：分页下推到 SQL，仅读取当前页。
     错误：未解锁或无权限时返回错误。
     返回：items 与 nextCursor。
     """
-    user_id, share = await ShareService.resolve_share(token, db)
-    if share.get("hasCode"):
-        access_token = _get_access_token(request)
-        if not access_token:
-            raise ServiceException(msg="需要提取码")
-        ok = await redis.get(ShareService.share_access_key(token, access_token))
-        if not ok:
-            raise ServiceException(msg="需要提取码")
-    items = await ShareService.list_share_entries(share, user_id, db, parent_id)
+    user_id, share = auth
     offset = int(cursor) if cursor and cursor.isdigit() else 0
-    end = offset + max(1, min(limit, 100))
-    next_cursor = str(end) if end < len(items) else None
-    return ResponseModel.success(
-        data={"items": items[offset:end], "nextCursor": next_cursor}
+    page_size = max(1, min(limit, 100))
+    items, has_more = await ShareService.list_share_entries(
+        share, user_id, db, parent_id, offset=offset, limit=page_size
     )
+    next_cursor = str(offset + page_size) if has_more else None
+    return ResponseModel.success(data={"items": items, "nextCursor": next_cursor})
 
 
+@public_shares_router.head("/{token}/content", summary="分享文件元信息")
 @public_shares_router.get("/{token}/content", summary="分享文件内容")
 async def get_share_content(
     token: str,
     request: Request,
     file_id: int | None = None,
     disposition: str = "attachment",
+    auth: tuple[int, dict] = Depends(_require_share_access),
     redis=Depends(get_async_redis),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -176,29 +258,31 @@ async def get_share_content(
     下载/预览公开分享中的文件。
     disposition=inline 时以预览方式返回。
     """
-    user_id, share = await ShareService.resolve_share(token, db)
-    if share.get("hasCode"):
-        access_token = _get_access_token(request)
-        if not access_token:
-            raise ServiceException(msg="需要提取码")
-        ok = await redis.get(ShareService.share_access_key(token, access_token))
-        if not ok:
-            raise ServiceException(msg="需要提取码")
-    file_path = await ShareService.download_share_file(share, user_id, db, file_id)
-    return FileService.build_download_response(
+    user_id, share = auth
+    target = await ShareService.download_share_file(share, user_id, db, file_id)
+    meta = await ShareService.get_file_meta_cached(token, target, redis)
+    return await FileService.build_download_response(
         request=request,
-        file_path=file_path,
-        filename=file_path.name,
+        file_path=target.path,
+        filename=target.path.name,
         inline=disposition == "inline",
         background=None,
+        size=meta.get("size"),
+        mtime=meta.get("mtime"),
+        media_type=meta.get("mime"),
     )
 
 
-@public_shares_router.post("/{token}/save", summary="保存到我的网盘")
+@public_shares_router.post(
+    "/{token}/save",
+    summary="保存到我的网盘",
+    response_model=ResponseModel[bool],
+)
 async def save_share(
     token: str,
     data: ShareSaveIn,
     current_user: User = Depends(require_user),
+    redis=Depends(get_async_redis),
     db: AsyncSession = Depends(get_async_session),
 ):
     """
@@ -211,7 +295,7 @@ async def save_share(
     性能：依赖后台复制/写入开销。
     返回：成功布尔值。
     """
-    owner_id, share = await ShareService.resolve_share(token, db)
+    owner_id, share = await ShareService.resolve_share(token, db, redis=redis)
     await ShareService.save_share_to_user(
         share=share,
         owner_id=owner_id,
@@ -9,10 +9,17 @@
 from fastapi import APIRouter, Depends
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
-from app.shared.deps import require_permissions, require_user
-from app.core.database import get_async_session
+from app.shared.deps import (
+    json_body,
+    json_body_openapi,
+    require_permissions,
+    require_user,
+)
+from app.core.database import get_async_redis, get_async_session
 from app.modules.disk.schemas.share import (
+    Share,
     ShareBatchIdsIn,
+    ShareBatchOut,
     ShareBatchStatusIn,
     ShareCreateIn,
     ShareListOut,
@@ -27,14 +34,18 @@ shares_router = APIRouter(
     dependencies=[Depends(require_user)],
 )
 
+_SHARE_CREATE_BODY = json_body(ShareCreateIn)
+
 
 @shares_router.post(
     "",
     summary="创建分享",
+    response_model=ResponseModel[Share],
     dependencies=[require_permissions(["disk:share:create"])],
+    openapi_extra=json_body_openapi(ShareCreateIn),
 )
 async def create_share(
-    data: ShareCreateIn,
+    data: ShareCreateIn = Depends(_SHARE_CREATE_BODY),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -105,12 +116,14 @@ async def list_shares(
 @shares_router.post(
     "/batch/status",
     summary="批量更新分享状态",
+    response_model=ResponseModel[ShareBatchOut],
     dependencies=[require_permissions(["disk:share:update"])],
 )
 async def batch_update_status(
     data: ShareBatchStatusIn,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     批量启用或禁用分享。
@@ -123,7 +136,7 @@ async def batch_update_status(
     返回：成功/失败统计。
     """
     result = await ShareService.batch_update_status(
-        current_user.id, data.ids, data.status, db
+        current_user.id, data.ids, data.status, db, redis
     )
     return ResponseModel.success(data=result)
 
@@ -131,6 +144,7 @@ async def batch_update_status(
 @shares_router.put(
     "/{share_id}",
     summary="更新分享",
+    response_model=ResponseModel[Share],
     dependencies=[require_permissions(["disk:share:update"])],
 )
 async def update_share(
@@ -138,6 +152,7 @@ async def update_share(
     data: ShareUpdateIn,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     更新分享配置（过期时间、提取码、状态）。
@@ -157,6 +172,7 @@ async def update_share(
         code=data.code,
         status=data.status,
         db=db,
+        redis=redis,
     )
     return ResponseModel.success(data=share)
 
@@ -164,12 +180,14 @@ async def update_share(
 @shares_router.post(
     "/batch/delete",
     summary="批量删除分享",
+    response_model=ResponseModel[ShareBatchOut],
     dependencies=[require_permissions(["disk:share:delete"])],
 )
 async def batch_delete_share(
     data: ShareBatchIdsIn,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     批量删除分享记录。
@@ -181,19 +199,21 @@ async def batch_delete_share(
     性能：批量删除减少往返。
     返回：成功/失败统计。
     """
-    result = await ShareService.batch_delete(current_user.id, data.ids, db)
+    result = await ShareService.batch_delete(current_user.id, data.ids, db, redis)
     return ResponseModel.success(data=result)
 
 
 @shares_router.delete(
     "/{share_id}",
     summary="删除分享",
+    response_model=ResponseModel[bool],
     dependencies=[require_permissions(["disk:share:delete"])],
 )
 async def delete_share(
     share_id: str,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     删除单个分享记录。
@@ -205,7 +225,7 @@ async def delete_share(
     性能：单条删除。
     返回：成功布尔值。
     """
-    await ShareService.delete_share(current_user.id, share_id, db)
+    await ShareService.delete_share(current_user.id, share_id, db, redis)
     return ResponseModel.success(data=True)
 
 
@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
 from app.shared.deps import require_permissions, require_user
-from app.core.database import get_async_session
+from app.core.database import get_async_redis, get_async_session
 from app.modules.disk.schemas.disk import (
     DiskTrashBatchIdsIn,
     DiskTrashBatchOut,
@@ -64,6 +64,7 @@ async def restore_trash(
     data: DiskTrashRestoreIn,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     恢复回收站条目到原父目录。
@@ -76,7 +77,7 @@ async def restore_trash(
     返回：恢复后的条目。
     """
     entry = await FileService.restore_trash(int(data.id), current_user.id, db)
-    await FileService.refresh_used_space(db, current_user.id)
+    await FileService.schedule_used_space_refresh(db, current_user.id, redis)
     return ResponseModel.success(data=entry)
 
 
@@ -90,6 +91,7 @@ async def batch_restore_trash(
     data: DiskTrashBatchIdsIn,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
 ):
     """
     批量恢复回收站条目。
@@ -104,7 +106,7 @@ async def batch_restore_trash(
     ids = [int(value) for value in data.ids]
     result = await FileService.batch_restore_trash(ids, current_user.id, db)
     if result.get("success"):
-        await FileService.refresh_used_space(db, current_user.id)
+        await FileService.schedule_used_space_refresh(db, current_user.id, redis)
     return ResponseModel.success(data=result)
 
 
@@ -8,14 +8,19 @@
 
 from typing import Any, Awaitable, Callable
 
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, Request, UploadFile
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.modules.admin.models.response import ResponseModel
 from app.modules.admin.models.user import User
-from app.core.database import get_async_session
+from app.core.database import get_async_redis, get_async_session
 from app.core.exception import ServiceException
-from app.shared.deps import require_permissions, require_user
+from app.shared.deps import (
+    json_body,
+    json_body_openapi,
+    require_permissions,
+    require_user,
+)
 from app.modules.disk.schemas.disk import (
     DiskUploadFinalizeIn,
     DiskUploadInitIn,
@@ -25,6 +30,7 @@ from app.modules.disk.schemas.disk import (
 )
 from app.modules.disk.domain.paths import rel_path_from_storage
 from app.modules.disk.services.file import FileService
+from app.modules.disk.services.share import ShareService
 from app.modules.system.deps import get_config
 from app.modules.system.typed.config import Config
 
@@ -34,6 +40,9 @@ uploads_router = APIRouter(
     dependencies=[Depends(require_user)],
 )
 
+_UPLOAD_INIT_BODY = json_body(DiskUploadInitIn)
+_UPLOAD_FINALIZE_BODY = json_body(DiskUploadFinalizeIn)
+
 
 async def _with_config(
     config: Config,
@@ -67,9 +76,10 @@ async def _build_upload_policy(config: Config) -> dict[str, Any]:
     summary="初始化分片上传",
     response_model=ResponseModel[DiskUploadInitOut],
     dependencies=[require_permissions(["disk:upload:init"])],
+    openapi_extra=json_body_openapi(DiskUploadInitIn),
 )
 async def init_upload(
-    data: DiskUploadInitIn,
+    data: DiskUploadInitIn = Depends(_UPLOAD_INIT_BODY),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
     config: Config = Depends(get_config),
@@ -147,6 +157,37 @@ async def upload_part(
     return ResponseModel.success(data=True)
 
 
+@uploads_router.put(
+    "/{upload_id}/parts/{part_number}/stream",
+    summary="上传分片(原始请求体)",
+    dependencies=[require_permissions(["disk:upload:part"])],
+)
+async def upload_part_stream(
+    request: Request,
+    upload_id: str,
+    part_number: int,
+    current_user: User = Depends(require_user),
+    db: AsyncSession = Depends(get_async_session),
+    config: Config = Depends(get_config),
+):
+    """
+    以 application/octet-stream 请求体上传分片。
+    请求体边读边写入分片文件，不经过 multipart 临时文件。
+    校验、幂等与并发语义与 multipart 分片接口一致。
+    返回：成功布尔值。
+    """
+    await _with_config(
+        config,
+        FileService.upload_part_stream,
+        db=db,
+        user_id=current_user.id,
+        upload_id=upload_id,
+        part_number=part_number,
+        chunks=request.stream(),
+    )
+    return ResponseModel.success(data=True)
+
+
 @uploads_router.get(
     "/{upload_id}",
     summary="查询上传状态",
@@ -186,12 +227,14 @@ async def upload_status(
     summary="完成分片上传",
     response_model=ResponseModel[FileEntryOut],
     dependencies=[require_permissions(["disk:upload:finalize"])],
+    openapi_extra=json_body_openapi(DiskUploadFinalizeIn),
 )
 async def finalize_upload(
     upload_id: str,
-    data: DiskUploadFinalizeIn,
+    data: DiskUploadFinalizeIn = Depends(_UPLOAD_FINALIZE_BODY),
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_async_session),
+    redis=Depends(get_async_redis),
     config: Config = Depends(get_config),
 ):
     """
@@ -217,12 +260,10 @@ async def finalize_upload(
         total_parts=data.total_parts,
         commit=False,
     )
-    await _with_config(
-        config,
-        FileService.refresh_used_space,
-        db,
-        current_user.id,
-    )
+    if data.overwrite:
+        # 覆盖会把同名旧文件移入回收站
+        await ShareService.invalidate_deleted_targets(current_user.id, db, redis)
+    await FileService.schedule_used_space_refresh(db, current_user.id, redis)
     return ResponseModel.success(data=_to_file_entry(entry))
 
 
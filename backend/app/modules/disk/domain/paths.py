@@ -11,6 +11,18 @@ from pathlib import PurePosixPath
 from app.modules.disk.domain.errors import DiskError
 
 
+def _is_plain_posix(path: str) -> bool:
+    # 已规范化的相对路径（DB 中存储的形式）可直接做字符串拼接，跳过 PurePosixPath 构造
+    return (
+        bool(path)
+        and not path.startswith(("/", "./"))
+        and not path.endswith(("/", "/."))
+        and "//" not in path
+        and "/./" not in path
+        and path != "."
+    )
+
+
 def ensure_name(name: str) -> str:
     """
     校验并规范化文件/目录名。
@@ -39,9 +51,12 @@ def build_storage_path(user_id: int, parent_storage_path: str | None, name: str)
     不依赖用户输入 path，避免语义混乱。
     权限假设：调用方已验证 parent 属于用户。
     并发：纯函数无状态。
-    性能：路径拼接开销可忽略。
+    性能：规范路径走字符串拼接，其余情况回退 PurePosixPath。
     返回：Posix 风格存储路径。
     """
+    base = parent_storage_path or str(user_id)
+    if name not in ("", ".") and "/" not in name and _is_plain_posix(base):
+        return f"{base}/{name}"
     if parent_storage_path:
         rel = PurePosixPath(parent_storage_path) / name
     else:
@@ -72,9 +87,16 @@ def rel_path_from_storage(user_id: int, storage_path: str) -> str:
     不会解析或访问真实文件系统。
     权限假设：调用方仅用于展示。
     并发：纯函数无状态。
-    性能：字符串处理开销极小。
+    性能：列表接口逐条调用，规范路径仅做前缀切片。
     返回：Posix 风格逻辑路径。
     """
+    if storage_path and _is_plain_posix(storage_path):
+        prefix = f"{user_id}/"
+        if storage_path.startswith(prefix):
+            return storage_path[len(prefix) :]
+        if storage_path == str(user_id):
+            return "."
+        return storage_path
     rel = PurePosixPath(storage_path or "")
     parts = list(rel.parts)
     if parts and parts[0] == str(user_id):
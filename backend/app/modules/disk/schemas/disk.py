@@ -11,7 +11,15 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field
 
 
-class FileEntryOut(BaseModel):
+class FrozenModel(BaseModel):
+    """
+    网盘接口模型基类：只读、忽略未知字段
+    """
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class FileEntryOut(FrozenModel):
     """
     文件或目录条目(DB 索引)
     """
@@ -29,7 +37,7 @@ class FileEntryOut(BaseModel):
     updated_at: datetime | None = None
 
 
-class FileListOut(BaseModel):
+class FileListOut(FrozenModel):
     """
     目录列表输出(DB)
     """
@@ -41,7 +49,7 @@ class FileListOut(BaseModel):
     page_size: int
 
 
-class FileMkdirIn(BaseModel):
+class FileMkdirIn(FrozenModel):
     """
     创建目录输入模型(DB)
     """
@@ -50,7 +58,7 @@ class FileMkdirIn(BaseModel):
     name: str
 
 
-class FileUploadOut(BaseModel):
+class FileUploadOut(FrozenModel):
     """
     上传输出模型(DB)
     """
@@ -58,7 +66,7 @@ class FileUploadOut(BaseModel):
     items: list[FileEntryOut]
 
 
-class FileDeleteFailure(BaseModel):
+class FileDeleteFailure(FrozenModel):
     """
     批量删除失败条目(DB)
     """
@@ -67,7 +75,7 @@ class FileDeleteFailure(BaseModel):
     error: str
 
 
-class FileDeleteIn(BaseModel):
+class FileDeleteIn(FrozenModel):
     """
     删除输入模型(DB)
     """
@@ -75,7 +83,7 @@ class FileDeleteIn(BaseModel):
     file_ids: list[int]
 
 
-class FileDeleteBatchOut(BaseModel):
+class FileDeleteBatchOut(FrozenModel):
     """
     批量删除输出模型(DB)
     """
@@ -84,7 +92,7 @@ class FileDeleteBatchOut(BaseModel):
     failed: list[FileDeleteFailure]
 
 
-class FileMoveIn(BaseModel):
+class FileMoveIn(FrozenModel):
     """
     移动输入模型(DB)
     """
@@ -94,7 +102,7 @@ class FileMoveIn(BaseModel):
     new_name: str | None = None
 
 
-class FileMoveBody(BaseModel):
+class FileMoveBody(FrozenModel):
     """
     移动请求体(新 API)
     """
@@ -103,7 +111,7 @@ class FileMoveBody(BaseModel):
     new_name: str | None = None
 
 
-class FileRenameIn(BaseModel):
+class FileRenameIn(FrozenModel):
     """
     重命名输入模型(DB)
     """
@@ -112,7 +120,7 @@ class FileRenameIn(BaseModel):
     new_name: str
 
 
-class FileRenameBody(BaseModel):
+class FileRenameBody(FrozenModel):
     """
     重命名请求体(新 API)
     """
@@ -120,7 +128,7 @@ class FileRenameBody(BaseModel):
     new_name: str
 
 
-class FileUpdateBody(BaseModel):
+class FileUpdateBody(FrozenModel):
     """
     文件或目录更新请求体(新 API)
     """
@@ -131,7 +139,7 @@ class FileUpdateBody(BaseModel):
     name: str | None = None
 
 
-class DiskEntry(BaseModel):
+class DiskEntry(FrozenModel):
     """
     文件或目录信息
     """
@@ -143,7 +151,7 @@ class DiskEntry(BaseModel):
     modified_time: datetime | None = None
 
 
-class DiskListOut(BaseModel):
+class DiskListOut(FrozenModel):
     """
     目录列表输出模型
     """
@@ -152,7 +160,7 @@ class DiskListOut(BaseModel):
     items: list[DiskEntry]
 
 
-class DiskUploadInitIn(BaseModel):
+class DiskUploadInitIn(FrozenModel):
     """
     分片上传初始化
     """
@@ -165,7 +173,7 @@ class DiskUploadInitIn(BaseModel):
     overwrite: bool = False
 
 
-class UploadConfigOut(BaseModel):
+class UploadConfigOut(FrozenModel):
     chunk_size_mb: int
     chunk_upload_threshold_mb: int
     max_parallel_chunks: int
@@ -177,7 +185,7 @@ class UploadConfigOut(BaseModel):
     max_single_file_mb: int
 
 
-class DiskUploadInitOut(BaseModel):
+class DiskUploadInitOut(FrozenModel):
     """
     分片上传初始化输出
     """
@@ -189,7 +197,7 @@ class DiskUploadInitOut(BaseModel):
     upload_config: UploadConfigOut
 
 
-class DiskUploadStatusOut(BaseModel):
+class DiskUploadStatusOut(FrozenModel):
     """
     分片上传状态
     """
@@ -202,7 +210,7 @@ class DiskUploadStatusOut(BaseModel):
     expires_in: int
 
 
-class DiskUploadFinalizeIn(BaseModel):
+class DiskUploadFinalizeIn(FrozenModel):
     """
     分片上传完成
     """
@@ -214,7 +222,7 @@ class DiskUploadFinalizeIn(BaseModel):
     total_parts: int | None = None
 
 
-class DiskMkdirIn(BaseModel):
+class DiskMkdirIn(FrozenModel):
     """
     创建目录输入模型
     """
@@ -222,7 +230,7 @@ class DiskMkdirIn(BaseModel):
     path: str
 
 
-class DiskDeleteIn(BaseModel):
+class DiskDeleteIn(FrozenModel):
     """
     删除输入模型
     """
@@ -231,7 +239,7 @@ class DiskDeleteIn(BaseModel):
     recursive: bool = False
 
 
-class DiskDeleteOut(BaseModel):
+class DiskDeleteOut(FrozenModel):
     """
     删除输出模型
     """
@@ -240,7 +248,7 @@ class DiskDeleteOut(BaseModel):
     deleted: bool
 
 
-class DiskDeleteFailure(BaseModel):
+class DiskDeleteFailure(FrozenModel):
     """
     批量删除失败条目
     """
@@ -249,7 +257,7 @@ class DiskDeleteFailure(BaseModel):
     error: str
 
 
-class DiskDeleteBatchOut(BaseModel):
+class DiskDeleteBatchOut(FrozenModel):
     """
     批量删除输出模型
     """
@@ -258,7 +266,7 @@ class DiskDeleteBatchOut(BaseModel):
     failed: list[DiskDeleteFailure]
 
 
-class DiskTrashEntry(BaseModel):
+class DiskTrashEntry(FrozenModel):
     """
     回收站条目
     """
@@ -271,7 +279,7 @@ class DiskTrashEntry(BaseModel):
     deleted_at: datetime
 
 
-class DiskTrashListOut(BaseModel):
+class DiskTrashListOut(FrozenModel):
     """
     回收站列表输出模型
     """
@@ -279,7 +287,7 @@ class DiskTrashListOut(BaseModel):
     items: list[DiskTrashEntry]
 
 
-class DiskTrashBatchIdsIn(BaseModel):
+class DiskTrashBatchIdsIn(FrozenModel):
     """
     回收站批量操作输入模型
     """
@@ -287,7 +295,7 @@ class DiskTrashBatchIdsIn(BaseModel):
     ids: list[str]
 
 
-class DiskTrashBatchOut(BaseModel):
+class DiskTrashBatchOut(FrozenModel):
     """
     回收站批量操作输出模型
     """
@@ -296,7 +304,7 @@ class DiskTrashBatchOut(BaseModel):
     failed: list[str]
 
 
-class DiskTrashRestoreIn(BaseModel):
+class DiskTrashRestoreIn(FrozenModel):
     """
     回收站恢复输入模型
     """
@@ -304,7 +312,7 @@ class DiskTrashRestoreIn(BaseModel):
     id: str
 
 
-class DiskTrashDeleteIn(BaseModel):
+class DiskTrashDeleteIn(FrozenModel):
     """
     回收站删除输入模型
     """
@@ -312,7 +320,7 @@ class DiskTrashDeleteIn(BaseModel):
     id: str
 
 
-class DiskShareCreateIn(BaseModel):
+class DiskShareCreateIn(FrozenModel):
     """
     分享创建输入模型
     """
@@ -321,7 +329,7 @@ class DiskShareCreateIn(BaseModel):
     expires_hours: int | None = 72
 
 
-class DiskShareEntry(BaseModel):
+class DiskShareEntry(FrozenModel):
     """
     分享条目
     """
@@ -334,7 +342,7 @@ class DiskShareEntry(BaseModel):
     expires_at: datetime | None = None
 
 
-class DiskShareListOut(BaseModel):
+class DiskShareListOut(FrozenModel):
     """
     分享列表输出模型
     """
@@ -342,7 +350,7 @@ class DiskShareListOut(BaseModel):
     items: list[DiskShareEntry]
 
 
-class DiskRenameItem(BaseModel):
+class DiskRenameItem(FrozenModel):
     """
     批量重命名输入条目
     """
@@ -352,7 +360,7 @@ class DiskRenameItem(BaseModel):
     overwrite: bool = False
 
 
-class DiskRenameIn(BaseModel):
+class DiskRenameIn(FrozenModel):
     """
     重命名输入模型
     """
@@ -360,7 +368,7 @@ class DiskRenameIn(BaseModel):
     items: list[DiskRenameItem]
 
 
-class DiskRenameFailure(BaseModel):
+class DiskRenameFailure(FrozenModel):
     """
     批量重命名失败条目
     """
@@ -370,7 +378,7 @@ class DiskRenameFailure(BaseModel):
     error: str
 
 
-class DiskRenameBatchOut(BaseModel):
+class DiskRenameBatchOut(FrozenModel):
     """
     批量重命名输出模型
     """
@@ -379,7 +387,7 @@ class DiskRenameBatchOut(BaseModel):
     failed: list[DiskRenameFailure]
 
 
-class DiskDownloadTokenIn(BaseModel):
+class DiskDownloadTokenIn(FrozenModel):
     """
     下载令牌输入模型
     """
@@ -388,7 +396,7 @@ class DiskDownloadTokenIn(BaseModel):
     job_id: str | None = None
 
 
-class DiskCompressIn(BaseModel):
+class DiskCompressIn(FrozenModel):
     """
     压缩输入模型
     """
@@ -397,7 +405,7 @@ class DiskCompressIn(BaseModel):
     name: str | None = None
 
 
-class DiskCompressBatchIn(BaseModel):
+class DiskCompressBatchIn(FrozenModel):
     """
     批量压缩输入模型
     """
@@ -406,7 +414,7 @@ class DiskCompressBatchIn(BaseModel):
     name: str | None = None
 
 
-class DiskExtractIn(BaseModel):
+class DiskExtractIn(FrozenModel):
     """
     解压输入模型
     """
@@ -414,7 +422,7 @@ class DiskExtractIn(BaseModel):
     file_id: int
 
 
-class DiskTextReadOut(BaseModel):
+class DiskTextReadOut(FrozenModel):
     """
     文本读取输出模型
     """
@@ -425,7 +433,7 @@ class DiskTextReadOut(BaseModel):
     modified_time: datetime | None = None
 
 
-class DiskTextSaveIn(BaseModel):
+class DiskTextSaveIn(FrozenModel):
     """
     文本保存输入模型
     """
@@ -435,7 +443,7 @@ class DiskTextSaveIn(BaseModel):
     overwrite: bool = False
 
 
-class FileTextSaveBody(BaseModel):
+class FileTextSaveBody(FrozenModel):
     """
     文本保存请求体(新 API)
     """
@@ -444,7 +452,7 @@ class FileTextSaveBody(BaseModel):
     overwrite: bool = False
 
 
-class DiskDownloadPrepareIn(BaseModel):
+class DiskDownloadPrepareIn(FrozenModel):
     """
     打包下载准备输入模型(DB)
     """
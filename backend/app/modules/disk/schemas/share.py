@@ -6,10 +6,10 @@
 @Description: 分享相关模型
 """
 
-from pydantic import BaseModel
+from app.modules.disk.schemas.disk import FrozenModel
 
 
-class Share(BaseModel):
+class Share(FrozenModel):
     id: str
     resourceType: str
     fileId: int
@@ -23,35 +23,35 @@ class Share(BaseModel):
     missing: bool | None = None
 
 
-class ShareCreateIn(BaseModel):
+class ShareCreateIn(FrozenModel):
     fileId: int
     expiresInDays: int | None = None
     expiresAt: int | None = None
     code: str | None = None
 
 
-class ShareUpdateIn(BaseModel):
+class ShareUpdateIn(FrozenModel):
     expiresInDays: int | None = None
     expiresAt: int | None = None
     code: str | None = None
     status: int | None = None
 
 
-class ShareBatchIdsIn(BaseModel):
+class ShareBatchIdsIn(FrozenModel):
     ids: list[str]
 
 
-class ShareBatchStatusIn(BaseModel):
+class ShareBatchStatusIn(FrozenModel):
     ids: list[str]
     status: int
 
 
-class ShareBatchOut(BaseModel):
+class ShareBatchOut(FrozenModel):
     success: int
     failed: list[str]
 
 
-class ShareListOut(BaseModel):
+class ShareListOut(FrozenModel):
     items: list[Share]
     total: int
     page: int
@@ -59,26 +59,36 @@ class ShareListOut(BaseModel):
     pages: int
 
 
-class ShareLockedOut(BaseModel):
+class ShareLockedOut(FrozenModel):
     locked: bool = True
     share: dict
 
 
-class ShareUnlockedOut(BaseModel):
+class ShareUnlockedOut(FrozenModel):
     locked: bool = False
     share: Share
     listing: list[dict] | None = None
     fileMeta: dict | None = None
 
 
-class ShareUnlockIn(BaseModel):
+class ShareUnlockIn(FrozenModel):
     code: str
 
 
-class ShareListQueryOut(BaseModel):
-    items: list[dict]
+class ShareEntry(FrozenModel):
+    id: int
+    name: str
+    parent_id: int | None = None
+    is_dir: bool
+    size: int
+    mime_type: str | None = None
+    updated_at: str | None = None
+
+
+class ShareListQueryOut(FrozenModel):
+    items: list[ShareEntry]
     nextCursor: str | None = None
 
 
-class ShareSaveIn(BaseModel):
+class ShareSaveIn(FrozenModel):
     targetParentId: int | None = None
@@ -12,6 +12,7 @@ import asyncio
 import json
 import io
 import mimetypes
+import os
 import secrets
 import time
 import tempfile
@@ -21,6 +22,7 @@ from uuid import uuid4
 from dataclasses import dataclass
 from hashlib import sha1
 from pathlib import Path, PurePosixPath
+from typing import AsyncIterator
 
 from fastapi import Request, UploadFile
 from starlette.background import BackgroundTask
@@ -45,8 +47,10 @@ from app.modules.disk.domain.paths import (
 from app.modules.disk.models.file import File
 from app.modules.disk.models.storage import Storage
 from app.modules.disk.storage.backends import get_storage_backend
+from app.modules.disk.storage.backends.base import StorageBackend
 from app.modules.disk.storage.streaming import (
     build_file_response as _build_file_response,
+    build_head_response as _build_head_response,
     build_inline_response as _build_inline_response,
     cleanup_abs_path as _cleanup_abs_path,
     content_disposition,
@@ -101,6 +105,27 @@ async def _extract_download(*_args, **_kwargs):
 class FileService:
     _UPLOAD_BUFFER_SIZE = int(settings.DISK_UPLOAD_BUFFER_SIZE or 1024 * 1024)
     _UPLOAD_CONCURRENCY_LIMIT = int(settings.DISK_UPLOAD_CONCURRENCY or 3)
+    _USAGE_REFRESH_DELAY = 2
+    _USAGE_REFRESH_LOCK_TTL = 5
+    _TOKEN_CACHE_TTL = 5
+    _TOKEN_CACHE_MAX_SIZE = 10_000
+    _token_cache: dict[str, tuple[float, dict]] = {}
+    _token_inflight: dict[str, asyncio.Future[dict | None]] = {}
+    _JOB_CACHE_TTL = 0.25
+    _JOB_DONE_CACHE_TTL = 5
+    _JOB_CACHE_MAX_SIZE = 10_000
+    _job_cache: dict[str, tuple[float, dict]] = {}
+    _COMPRESS_JOB_PREFIX = "disk:compress:"
+    _EXTRACT_JOB_PREFIX = "disk:extract:"
+    _DOWNLOAD_JOB_PREFIX = "disk:download:"
+    _ARCHIVE_JOB_PREFIXES = {
+        "compress": _COMPRESS_JOB_PREFIX,
+        "extract": _EXTRACT_JOB_PREFIX,
+    }
+    _ARCHIVE_JOB_CONCURRENCY = max(1, os.cpu_count() or 1)
+    _PURGE_CONCURRENCY = 8
+    _archive_job_semaphore = asyncio.Semaphore(_ARCHIVE_JOB_CONCURRENCY)
+    _background_tasks: set[asyncio.Task] = set()
     _upload_semaphores: dict[int, tuple[int, asyncio.Semaphore]] = {}
     _upload_semaphore_lock = asyncio.Lock()
     _runtime_config_ctx: ContextVar[Config | None] = ContextVar(
@@ -393,7 +418,7 @@ class FileService:
 
         try:
             # 先创建物理目录，确保路径有效且可写。
-            backend.ensure_dir(storage_path)
+            await asyncio.to_thread(backend.ensure_dir, storage_path)
         except Exception as exc:
             raise ServiceException(msg=str(exc)) from exc
 
@@ -456,7 +481,7 @@ class FileService:
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
         upload_id = cls._make_upload_id(1)
-        backend.ensure_upload_session(user_id, upload_id)
+        await asyncio.to_thread(backend.ensure_upload_session, user_id, upload_id)
         try:
             size = await cls._with_upload_limit(
                 user_id,
@@ -465,7 +490,9 @@ class FileService:
             )
             max_size = await cls._upload_max_size_bytes(db)
             if max_size and size > max_size:
-                backend.delete_upload_session(user_id, upload_id)
+                await asyncio.to_thread(
+                    backend.delete_upload_session, user_id, upload_id
+                )
                 raise ServiceException(msg="文件大小超过上传限制")
             entry = await cls.finalize_upload(
                 db=db,
@@ -614,14 +641,11 @@ class FileService:
         ids = [target.id]
         descendants: list[File] = []
         if target.is_dir:
-            ids.extend(
-                await cls._collect_descendants(
-                    db, user_id, [target.id], include_deleted=False
-                )
-            )
+            # 子孙节点只遍历一次，id 列表直接取自已加载的条目
             descendants = await cls._collect_descendant_entries(
                 db, user_id, [target.id], include_deleted=False
             )
+            ids.extend(item.id for item in descendants)
         entries = [target, *descendants]
         now = datetime.now()
         deleted_at_token = f"{int(now.timestamp() * 1000)}_{uuid4().hex[:8]}"
@@ -725,7 +749,9 @@ class FileService:
             if hasattr(backend, "cleanup_empty_parents"):
                 try:
                     trash_root = f".trash/{user_id}"
-                    backend.cleanup_empty_parents(old_path, trash_root)
+                    await asyncio.to_thread(
+                        backend.cleanup_empty_parents, old_path, trash_root
+                    )
                 except Exception:
                     pass
         descendants: list[File] = []
@@ -909,6 +935,34 @@ class FileService:
             await db.refresh(user)
         return total
 
+    @classmethod
+    async def schedule_used_space_refresh(
+        cls, db: AsyncSession, user_id: int, redis
+    ) -> None:
+        """
+        提交当前事务并合并短时间内的已用空间刷新。
+        同一用户在防抖窗口内只有首个请求会调度后台刷新。
+        后台任务延迟执行，批量上传/删除只触发一次聚合查询。
+        刷新前先释放防抖键，窗口内后续变更会重新调度，不会漏算。
+        """
+        await db.commit()
+        key = f"disk:usage:refresh:{user_id}"
+        if not await redis.set(
+            key, "1", ex=cls._USAGE_REFRESH_LOCK_TTL, nx=True
+        ):
+            return
+        cls._spawn(cls._run_used_space_refresh(user_id, key, redis))
+
+    @classmethod
+    async def _run_used_space_refresh(cls, user_id: int, key: str, redis) -> None:
+        await asyncio.sleep(cls._USAGE_REFRESH_DELAY)
+        try:
+            await redis.delete(key)
+            async with async_session() as session:
+                await cls.refresh_used_space(session, user_id)
+        except Exception as exc:
+            logger.warning("刷新用户已用空间失败: user_id=%s, error=%s", user_id, exc)
+
     @classmethod
     async def _collect_descendants(
         cls,
@@ -1036,7 +1090,7 @@ class FileService:
         upload_id = cls._make_upload_id(total_parts)
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        backend.ensure_upload_session(user_id, upload_id)
+        await asyncio.to_thread(backend.ensure_upload_session, user_id, upload_id)
         return {
             "upload_id": upload_id,
             "part_size": part_size,
@@ -1063,6 +1117,50 @@ class FileService:
         错误：冲突或会话不存在时抛错。
         返回：写入分片大小。
         """
+        try:
+            backend = await cls._get_part_upload_backend(
+                db, user_id, upload_id, part_number
+            )
+            size = await cls._with_upload_limit(
+                user_id,
+                db,
+                backend.write_upload_part(user_id, upload_id, part_number, upload),
+            )
+            return size
+        finally:
+            await upload.close()
+
+    @classmethod
+    async def upload_part_stream(
+        cls,
+        db: AsyncSession,
+        user_id: int,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+    ) -> int:
+        """
+        以原始请求体写入指定分片。
+        与 upload_part 校验一致，但不经过 UploadFile 临时文件。
+        返回：写入分片大小。
+        """
+        backend = await cls._get_part_upload_backend(
+            db, user_id, upload_id, part_number
+        )
+        return await cls._with_upload_limit(
+            user_id,
+            db,
+            backend.write_upload_part_stream(user_id, upload_id, part_number, chunks),
+        )
+
+    @classmethod
+    async def _get_part_upload_backend(
+        cls,
+        db: AsyncSession,
+        user_id: int,
+        upload_id: str,
+        part_number: int,
+    ) -> StorageBackend:
         if part_number <= 0:
             raise ServiceException(msg="分片编号不合法")
         total_parts = cls._parse_upload_id(upload_id)
@@ -1072,22 +1170,17 @@ class FileService:
             raise ServiceException(msg="分片编号超出范围")
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        state = backend.get_upload_session_state(user_id, upload_id)
+        # 每个分片都会校验一次，只取会话标记，不扫描已上传分片
+        state = await asyncio.to_thread(
+            backend.get_upload_session_state, user_id, upload_id, False
+        )
         if not state.get("exists"):
             raise ServiceException(msg="上传会话不存在")
         if state.get("done"):
             raise ServiceException(msg="上传会话已完成")
         if state.get("locked"):
             raise ServiceException(msg="上传正在合并")
-        try:
-            size = await cls._with_upload_limit(
-                user_id,
-                db,
-                backend.write_upload_part(user_id, upload_id, part_number, upload),
-            )
-            return size
-        finally:
-            await upload.close()
+        return backend
 
     @classmethod
     async def get_upload_status(
@@ -1111,7 +1204,9 @@ class FileService:
             raise ServiceException(msg="无法解析分片总数")
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        state = backend.get_upload_session_state(user_id, upload_id)
+        state = await asyncio.to_thread(
+            backend.get_upload_session_state, user_id, upload_id
+        )
         if not state.get("exists"):
             raise ServiceException(msg="上传会话不存在")
         parts = state.get("parts") or []
@@ -1161,7 +1256,7 @@ class FileService:
         通过 .lock 文件保证 finalize 并发安全。
         若 .done 已存在则直接返回已完成文件。
         合并完成后进行原子替换与 fsync。
-        DB 写入失败会回滚并清理临时文件。
+        DB 写入失败会回滚，并把合并结果还原为分片，会话可重试。
         total_parts 支持从 upload_id 推断。
         幂等：重复 finalize 会返回相同结果。
         返回：创建的 File 记录。
@@ -1172,7 +1267,9 @@ class FileService:
             raise ServiceException(msg="分片总数缺失")
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        state = backend.get_upload_session_state(user_id, upload_id)
+        state = await asyncio.to_thread(
+            backend.get_upload_session_state, user_id, upload_id
+        )
         if not state.get("exists"):
             raise ServiceException(msg="上传会话不存在")
         if state.get("done"):
@@ -1181,7 +1278,7 @@ class FileService:
             db, user_id, parent_id, safe_name, overwrite
         )
         # 通过独占锁避免并发 finalize 造成重复合并。
-        if not backend.acquire_upload_lock(user_id, upload_id):
+        if not await asyncio.to_thread(backend.acquire_upload_lock, user_id, upload_id):
             raise ServiceException(msg="上传正在合并")
         try:
             parts = state.get("parts") or []
@@ -1216,18 +1313,23 @@ class FileService:
                     await db.commit()
                 else:
                     await db.flush()
-            except IntegrityError as exc:
+            except Exception as exc:
                 await db.rollback()
+                # 合并已取走分片 1，还原后会话仍可重试 finalize
                 try:
-                    await backend.delete(storage_path, is_dir=False)
+                    await asyncio.to_thread(
+                        backend.restore_merged_upload, user_id, upload_id, storage_path
+                    )
                 except Exception:
                     pass
-                raise ServiceException(msg="文件已存在") from exc
+                if isinstance(exc, IntegrityError):
+                    raise ServiceException(msg="文件已存在") from exc
+                raise
             await db.refresh(entry)
-            backend.mark_upload_done(user_id, upload_id)
+            await asyncio.to_thread(backend.mark_upload_done, user_id, upload_id)
             return entry
         finally:
-            backend.release_upload_lock(user_id, upload_id)
+            await asyncio.to_thread(backend.release_upload_lock, user_id, upload_id)
 
     @classmethod
     async def cancel_upload(
@@ -1248,12 +1350,14 @@ class FileService:
         """
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        state = backend.get_upload_session_state(user_id, upload_id)
+        state = await asyncio.to_thread(
+            backend.get_upload_session_state, user_id, upload_id
+        )
         if not state.get("exists"):
             return
         if state.get("locked"):
             raise ServiceException(msg="上传正在合并")
-        backend.delete_upload_session(user_id, upload_id)
+        await asyncio.to_thread(backend.delete_upload_session, user_id, upload_id)
 
     @classmethod
     async def gc_uploads(
@@ -1273,7 +1377,8 @@ class FileService:
         """
         storage = await cls.get_default_storage(db)
         backend = get_storage_backend(storage)
-        return backend.gc_upload_sessions(
+        return await asyncio.to_thread(
+            backend.gc_upload_sessions,
             session_ttl=cls._session_ttl(),
             done_ttl=cls._done_ttl(),
             dry_run=dry_run,
@@ -1294,17 +1399,6 @@ class FileService:
             raise ServiceException(msg="文件不存在")
         return entry
 
-    @staticmethod
-    def _decode_redis_hash(data: dict) -> dict:
-        decoded: dict[str, str] = {}
-        for key, value in data.items():
-            if isinstance(key, bytes):
-                key = key.decode()
-            if isinstance(value, bytes):
-                value = value.decode()
-            decoded[str(key)] = str(value)
-        return decoded
-
     @classmethod
     async def read_text_file(cls, db: AsyncSession, file_id: int, user_id: int) -> dict:
         """
@@ -1331,39 +1425,106 @@ class FileService:
         }
 
     @staticmethod
-    def build_download_response(
+    async def build_download_response(
         request: Request,
         file_path: Path,
         filename: str,
         inline: bool,
         background: BackgroundTask | None = None,
+        size: int | None = None,
+        mtime: int | None = None,
+        media_type: str | None = None,
     ):
         """
         构建文件下载或预览响应。
         使用 Range 支持与标准头部输出。
         inline 控制 Content-Disposition 行为。
         background 可用于清理临时文件。
+        size/mtime/media_type 由调用方提供时跳过 stat 与类型推断。
         不读取文件内容，交由响应层流式输出。
         幂等：同参数返回一致 header。
         性能：响应层按需读取文件。
         返回：StreamingResponse 或 FileResponse。
         """
         if inline:
-            media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
-            return _build_inline_response(
+            media_type = (
+                media_type
+                or mimetypes.guess_type(filename)[0]
+                or "application/octet-stream"
+            )
+            return await _build_inline_response(
                 request=request,
                 file_path=file_path,
                 filename=filename,
                 media_type=media_type,
                 background=background,
+                size=size,
+                mtime=mtime,
             )
-        return _build_file_response(
+        return await _build_file_response(
             request=request,
             file_path=file_path,
             filename=filename,
             background=background,
+            size=size,
+            mtime=mtime,
+        )
+
+    @classmethod
+    async def _token_file_meta(cls, db: AsyncSession, entry: File) -> dict:
+        """
+        签发 token 时记录文件 size/mtime，下载时免去 stat。
+        etag 用于判断文件在签发后是否被改写。
+        目录或文件缺失时返回空字典，下载时回退到 stat。
+        """
+        if entry.is_dir:
+            return {}
+        storage = await cls._get_storage_by_id(db, entry.storage_id)
+        backend = get_storage_backend(storage)
+        abs_path = backend.resolve_abs_path(entry.storage_path)
+        try:
+            stat = await asyncio.to_thread(abs_path.stat)
+        except OSError:
+            return {}
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns // 1_000_000_000,
+            "etag": entry.etag,
+        }
+
+    @staticmethod
+    def build_head_response(
+        request: Request,
+        filename: str,
+        inline: bool,
+        size: int,
+        mtime: int,
+    ) -> Response:
+        """
+        构建 token 下载/预览的 HEAD 响应。
+        size/mtime 来自 token payload，无需 prepare_download 与 stat。
+        返回：仅含头部的响应。
+        """
+        media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        return _build_head_response(
+            request=request,
+            filename=filename,
+            size=size,
+            mtime=mtime,
+            inline=inline,
+            media_type=media_type,
         )
 
+    @staticmethod
+    def _cached_file_meta(payload: dict, entry: File) -> tuple[int | None, int | None]:
+        if payload.get("etag") != entry.etag:
+            return None, None
+        size = payload.get("size")
+        mtime = payload.get("mtime")
+        if size is None or mtime is None:
+            return None, None
+        return int(size), int(mtime)
+
     @classmethod
     async def issue_download_url(
         cls,
@@ -1388,7 +1549,8 @@ class FileService:
         entry = await cls._get_active_file(db, user_id, file_id)
         ttl = await cls._download_token_ttl(db)
         now = int(time.time())
-        token = secrets.token_urlsafe(32)
+        # 128 位随机数足以防猜测，URL 与 Redis 键缩短到 22 字符
+        token = secrets.token_urlsafe(16)
         client_ip = cls._extract_client_ip(request)
         user_agent = request.headers.get("user-agent", "")
         payload = {
@@ -1400,6 +1562,7 @@ class FileService:
             "filename_hint": entry.name,
             "ip": client_ip,
             "ua": user_agent,
+            **await cls._token_file_meta(db, entry),
         }
         key = f"dl:tok:{token}"
         # 使用 TTL 控制有效期，避免长期可用的下载链接。
@@ -1434,7 +1597,8 @@ class FileService:
             raise ServiceException(msg="目录不支持预览")
         ttl = await cls._preview_token_ttl(db)
         now = int(time.time())
-        token = secrets.token_urlsafe(32)
+        # 128 位随机数足以防猜测，URL 与 Redis 键缩短到 22 字符
+        token = secrets.token_urlsafe(16)
         client_ip = cls._extract_client_ip(request)
         user_agent = request.headers.get("user-agent", "")
         payload = {
@@ -1446,6 +1610,7 @@ class FileService:
             "filename_hint": entry.name,
             "ip": client_ip,
             "ua": user_agent,
+            **await cls._token_file_meta(db, entry),
         }
         key = f"dl:tok:{token}"
         await redis.setex(key, ttl, json.dumps(payload, ensure_ascii=False))
@@ -1453,6 +1618,70 @@ class FileService:
         url = f"{prefix}/files/{entry.id}/preview?token={token}"
         return {"url": url, "expires_in": ttl}
 
+    @classmethod
+    async def _load_download_token(cls, token: str, redis) -> dict | None:
+        """
+        读取并解析下载 token payload。
+        热门链接会被同一 token 反复请求：命中进程内短 TTL 缓存直接返回，
+        未命中时同一 token 的并发请求合并为一次 Redis GET（single-flight）。
+        token 签发后不再修改，过期仍由 payload 内 expires_at 兜底校验。
+        缓存的是解析后的 payload，命中时无需重复 json.loads；调用方只读不改。
+        返回：payload 字典，不存在时为 None。
+        """
+        now = time.monotonic()
+        cached = cls._token_cache.get(token)
+        if cached:
+            expires_at, payload = cached
+            if now <= expires_at:
+                return payload
+            cls._token_cache.pop(token, None)
+        inflight = cls._token_inflight.get(token)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # 发起请求被取消时退回自行读取。
+            return await cls._read_download_token(token, redis)
+        future: asyncio.Future[dict | None] = asyncio.get_running_loop().create_future()
+        cls._token_inflight[token] = future
+        try:
+            payload = await cls._read_download_token(token, redis)
+            if payload:
+                if len(cls._token_cache) >= cls._TOKEN_CACHE_MAX_SIZE:
+                    cls._prune_token_cache(now)
+                cls._token_cache[token] = (now + cls._TOKEN_CACHE_TTL, payload)
+            future.set_result(payload)
+            return payload
+        except Exception as exc:
+            future.set_exception(exc)
+            # 无等待者时消费异常，避免 "exception was never retrieved" 警告。
+            future.exception()
+            raise
+        finally:
+            cls._token_inflight.pop(token, None)
+            if not future.done():
+                future.cancel()
+
+    @staticmethod
+    async def _read_download_token(token: str, redis) -> dict | None:
+        raw = await redis.get(f"dl:tok:{token}")
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except Exception as exc:
+            raise ServiceException(msg="下载令牌解析失败") from exc
+
+    @classmethod
+    def _prune_token_cache(cls, now: float) -> None:
+        expired = [key for key, (expires_at, _) in cls._token_cache.items() if expires_at < now]
+        for key in expired:
+            cls._token_cache.pop(key, None)
+        if len(cls._token_cache) >= cls._TOKEN_CACHE_MAX_SIZE:
+            cls._token_cache.clear()
+
     @classmethod
     async def verify_download_token(
         cls, request: Request, file_id: int, token: str, redis, action: str = "download"
@@ -1465,21 +1694,15 @@ class FileService:
         同时校验 IP/UA，降低链接被转发滥用风险。
         安全点：即便 token 存在也拒绝不匹配资源。
         并发：只读 Redis，不改变状态。
-        性能：一次 Redis 读取与 JSON 解析。
+        性能：进程内短缓存 + single-flight，重复 token 通常不访问 Redis。
         错误：失败时抛出 ServiceException。
         返回：payload 字典。
         """
         if not token:
             raise ServiceException(msg="下载令牌无效")
-        raw = await redis.get(f"dl:tok:{token}")
-        if not raw:
+        payload = await cls._load_download_token(token, redis)
+        if not payload:
             raise ServiceException(msg="下载令牌不存在或已过期")
-        if isinstance(raw, (bytes, bytearray)):
-            raw = raw.decode("utf-8")
-        try:
-            payload = json.loads(raw)
-        except Exception as exc:
-            raise ServiceException(msg="下载令牌解析失败") from exc
         if payload.get("act") != action:
             raise ServiceException(msg="下载令牌类型错误")
         if int(payload.get("rid") or 0) != int(file_id):
@@ -1526,7 +1749,7 @@ class FileService:
             file_path, filename, cleanup, _ = await cls.prepare_download(
                 db, entry.id, user_id
             )
-            response = cls.build_download_response(
+            response = await cls.build_download_response(
                 request=request,
                 file_path=file_path,
                 filename=filename,
@@ -1574,18 +1797,39 @@ class FileService:
             entry = await cls._get_active_file(db, uid, file_id)
             if entry.is_dir:
                 filename = f"{entry.name or 'root'}.zip"
+                if request.method == "HEAD":
+                    # ZIP 流长度未知，HEAD 只返回类型与文件名，不触发打包。
+                    response = Response(
+                        status_code=200,
+                        media_type="application/zip",
+                        headers={
+                            "Content-Disposition": content_disposition(
+                                filename, inline=False
+                            )
+                        },
+                    )
+                    del response.headers["content-length"]
+                    return response
                 response = await cls.download_folder_zip_stream(
                     request=request, db=db, root=entry, filename=filename
                 )
             else:
+                size, mtime = cls._cached_file_meta(payload, entry)
+                if request.method == "HEAD" and size is not None:
+                    # HEAD 探测只需元信息，跳过 prepare_download。
+                    return cls.build_head_response(
+                        request, entry.name, False, size, mtime
+                    )
                 file_path, filename, cleanup, _ = await cls.prepare_download(db, entry.id, uid)
                 background = BackgroundTask(_cleanup_abs_path, file_path) if cleanup else None
-                response = cls.build_download_response(
+                response = await cls.build_download_response(
                     request=request,
                     file_path=file_path,
                     filename=filename,
                     inline=False,
                     background=background,
+                    size=size,
+                    mtime=mtime,
                 )
             return response
         except Exception as exc:
@@ -1620,14 +1864,20 @@ class FileService:
         entry = await cls._get_active_file(db, uid, file_id)
         if entry.is_dir:
             raise ServiceException(msg="目录不支持预览")
+        size, mtime = cls._cached_file_meta(payload, entry)
+        if request.method == "HEAD" and size is not None:
+            # HEAD 探测只需元信息，跳过 prepare_download。
+            return cls.build_head_response(request, entry.name, True, size, mtime)
         file_path, filename, cleanup, _ = await cls.prepare_download(db, entry.id, uid)
         background = BackgroundTask(_cleanup_abs_path, file_path) if cleanup else None
-        return cls.build_download_response(
+        return await cls.build_download_response(
             request=request,
             file_path=file_path,
             filename=filename,
             inline=True,
             background=background,
+            size=size,
+            mtime=mtime,
         )
 
     @classmethod
@@ -1745,17 +1995,14 @@ class FileService:
         shard = cache_key[:2] or "00"
         return root / str(file_id) / shard / f"{cache_key}.{ext}"
 
-    @classmethod
-    def _thumbnail_cache_file_dir(cls, storage: Storage, file_id: int) -> Path:
-        root = cls._thumbnail_cache_root(storage)
-        return root / str(file_id)
-
     @staticmethod
     async def _read_cached_thumbnail(path: Path) -> bytes | None:
         def _sync_read() -> bytes | None:
-            if not path.exists() or not path.is_file():
+            # 直接读取，缺失/非文件时按未命中处理，省去两次 stat 且无检查-使用竞态
+            try:
+                return path.read_bytes()
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
                 return None
-            return path.read_bytes()
 
         return await asyncio.to_thread(_sync_read)
 
@@ -1770,14 +2017,20 @@ class FileService:
         await asyncio.to_thread(_sync_write)
 
     @classmethod
-    async def _purge_thumbnail_cache_for_file(cls, storage: Storage, file_id: int) -> None:
-        cache_dir = cls._thumbnail_cache_file_dir(storage, file_id)
-
+    async def _purge_thumbnail_cache_for_files(
+        cls, items: list[tuple[Storage, int]]
+    ) -> None:
+        # 批量删除在同一线程内完成，每个存储的缓存根目录只 resolve 一次
         def _sync_delete() -> None:
-            if cache_dir.exists():
-                import shutil
+            import shutil
 
-                shutil.rmtree(cache_dir, ignore_errors=True)
+            roots: dict[int, Path] = {}
+            for storage, file_id in items:
+                root = roots.get(storage.id)
+                if root is None:
+                    root = roots[storage.id] = cls._thumbnail_cache_root(storage)
+                # ignore_errors 已覆盖目录不存在的情况，无需预先 stat
+                shutil.rmtree(root / str(file_id), ignore_errors=True)
 
         await asyncio.to_thread(_sync_delete)
 
@@ -1871,7 +2124,7 @@ class FileService:
         storage = await cls._get_storage_by_id(db, entry.storage_id)
         backend = get_storage_backend(storage)
         abs_path = backend.resolve_abs_path(entry.storage_path)
-        if not backend.exists_abs_path(abs_path):
+        if not await asyncio.to_thread(backend.exists_abs_path, abs_path):
             raise ServiceException(msg="文件不存在")
         if entry.updated_at:
             version = int(entry.updated_at.timestamp())
@@ -1999,17 +2252,17 @@ class FileService:
         if not file.is_dir:
             raise ServiceException(msg="文件无需打包")
         job_id = uuid4().hex
-        key = f"disk:download:{job_id}"
-        await redis.hset(
+        key = cls._DOWNLOAD_JOB_PREFIX + job_id
+        await cls._write_job(
             key,
-            mapping={
+            redis,
+            {
                 "status": "ready",
                 "user_id": str(user_id),
                 "file_id": str(file_id),
                 "filename": f"{file.name or 'root'}.zip",
             },
         )
-        await redis.expire(key, 10800)
         return job_id
 
     @classmethod
@@ -2027,10 +2280,11 @@ class FileService:
         返回：job_id。
         """
         job_id = uuid4().hex
-        key = f"disk:compress:{job_id}"
-        await redis.hset(
+        key = cls._COMPRESS_JOB_PREFIX + job_id
+        await cls._write_job(
             key,
-            mapping={
+            redis,
+            {
                 "status": "pending",
                 "user_id": str(user_id),
                 "file_id": str(file_id),
@@ -2038,10 +2292,7 @@ class FileService:
                 "usage_updated": "0",
             },
         )
-        await redis.expire(key, 10800)
-        asyncio.create_task(
-            cls._run_compress_job(job_id, user_id, file_id, name, redis)
-        )
+        cls._spawn(cls._run_compress_job(job_id, user_id, file_id, name, redis))
         return job_id
 
     @classmethod
@@ -2052,10 +2303,11 @@ class FileService:
         if not ids:
             raise ServiceException(msg="缺少压缩目标")
         job_id = uuid4().hex
-        key = f"disk:compress:{job_id}"
-        await redis.hset(
+        key = cls._COMPRESS_JOB_PREFIX + job_id
+        await cls._write_job(
             key,
-            mapping={
+            redis,
+            {
                 "status": "pending",
                 "user_id": str(user_id),
                 "file_ids": ",".join(str(i) for i in ids),
@@ -2063,10 +2315,7 @@ class FileService:
                 "usage_updated": "0",
             },
         )
-        await redis.expire(key, 10800)
-        asyncio.create_task(
-            cls._run_compress_batch_job(job_id, user_id, ids, name, redis)
-        )
+        cls._spawn(cls._run_compress_batch_job(job_id, user_id, ids, name, redis))
         return job_id
 
     @classmethod
@@ -2089,18 +2338,18 @@ class FileService:
         if not file.name.lower().endswith(".zip"):
             raise ServiceException(msg="仅支持 ZIP 文件解压")
         job_id = uuid4().hex
-        key = f"disk:extract:{job_id}"
-        await redis.hset(
+        key = cls._EXTRACT_JOB_PREFIX + job_id
+        await cls._write_job(
             key,
-            mapping={
+            redis,
+            {
                 "status": "pending",
                 "user_id": str(user_id),
                 "file_id": str(file_id),
                 "usage_updated": "0",
             },
         )
-        await redis.expire(key, 10800)
-        asyncio.create_task(cls._run_extract_job(job_id, user_id, file_id, redis))
+        cls._spawn(cls._run_extract_job(job_id, user_id, file_id, redis))
         return job_id
 
     @classmethod
@@ -2115,14 +2364,9 @@ class FileService:
         失败：任务不存在会抛出异常。
         返回：状态字典。
         """
-        key = f"disk:compress:{job_id}"
+        key = cls._COMPRESS_JOB_PREFIX + job_id
         decoded = await cls._get_job_data(key, user_id, redis, "压缩任务不存在")
-        return {
-            "status": decoded.get("status", "pending"),
-            "message": decoded.get("error", ""),
-            "output_path": decoded.get("output_path", ""),
-            "usage_updated": decoded.get("usage_updated", "0"),
-        }
+        return cls._archive_job_status(decoded)
 
     @classmethod
     async def get_extract_job_status(cls, job_id: str, user_id: int, redis) -> dict:
@@ -2136,8 +2380,46 @@ class FileService:
         失败：任务不存在会抛出异常。
         返回：状态字典。
         """
-        key = f"disk:extract:{job_id}"
+        key = cls._EXTRACT_JOB_PREFIX + job_id
         decoded = await cls._get_job_data(key, user_id, redis, "解压任务不存在")
+        return cls._archive_job_status(decoded)
+
+    @classmethod
+    async def get_jobs_status(
+        cls, kind: str, job_ids: list[str], user_id: int, redis
+    ) -> dict[str, dict]:
+        """
+        批量获取压缩/解压任务状态。
+        前端同时展示多个任务时合并轮询，一次 Redis 往返。
+        不存在或无权访问的任务不出现在结果中。
+        返回：job_id -> 状态字典。
+        """
+        prefix = cls._ARCHIVE_JOB_PREFIXES.get(kind)
+        if prefix is None:
+            raise ServiceException(msg="不支持的任务类型")
+        jobs = await cls._get_job_data_many(
+            [prefix + job_id for job_id in job_ids], user_id, redis
+        )
+        return {
+            key[len(prefix) :]: cls._archive_job_status(decoded)
+            for key, decoded in jobs.items()
+        }
+
+    @classmethod
+    async def mark_job_usage_updated(cls, kind: str, job_id: str, redis) -> None:
+        """
+        标记压缩/解压任务已刷新过用户已用空间。
+        后续轮询读到标记后不再重复触发刷新。
+        返回：None。
+        """
+        prefix = cls._ARCHIVE_JOB_PREFIXES.get(kind)
+        if prefix is None:
+            raise ServiceException(msg="不支持的任务类型")
+        await cls._write_job(prefix + job_id, redis, {"usage_updated": "1"})
+
+    @staticmethod
+    def _archive_job_status(decoded: dict) -> dict:
+        # 轮询响应只取固定四个字段，返回新字典供调用方回写 usage_updated
         return {
             "status": decoded.get("status", "pending"),
             "message": decoded.get("error", ""),
@@ -2147,7 +2429,7 @@ class FileService:
 
     @classmethod
     async def get_download_job_status(cls, job_id: str, user_id: int, redis) -> dict:
-        key = f"disk:download:{job_id}"
+        key = cls._DOWNLOAD_JOB_PREFIX + job_id
         decoded = await cls._get_job_data(key, user_id, redis, "下载任务不存在")
         return {
             "status": decoded.get("status", "pending"),
@@ -2159,7 +2441,7 @@ class FileService:
     async def get_download_job_target(
         cls, db: AsyncSession, job_id: str, user_id: int, redis
     ) -> tuple[File, str]:
-        key = f"disk:download:{job_id}"
+        key = cls._DOWNLOAD_JOB_PREFIX + job_id
         decoded = await cls._get_job_data(key, user_id, redis, "下载任务不存在")
         if decoded.get("status") != "ready":
             raise ServiceException(msg="任务尚未完成")
@@ -2176,14 +2458,75 @@ class FileService:
     async def _get_job_data(
         cls, key: str, user_id: int, redis, not_found_msg: str
     ) -> dict:
-        data = await redis.hgetall(key)
-        if not data:
-            raise ServiceException(msg=not_found_msg)
-        decoded = cls._decode_redis_hash(data)
+        """
+        读取任务状态哈希并校验归属。
+        前端按秒轮询状态：进程内缓存 250ms 合并突发轮询，
+        ready/error 为终态，缓存延长到 5 秒；本进程写入任务时同步失效。
+        错误：任务不存在或不属于当前用户时抛出 ServiceException。
+        返回：解码后的任务字段（缓存本身，调用方只读不改）。
+        """
+        now = time.monotonic()
+        cached = cls._job_cache.get(key)
+        if cached and cached[0] >= now:
+            decoded = cached[1]
+        else:
+            data = await redis.hgetall(key)
+            if not data:
+                cls._job_cache.pop(key, None)
+                raise ServiceException(msg=not_found_msg)
+            decoded = cls._cache_job_data(key, data, now)
         if decoded.get("user_id") != str(user_id):
             raise ServiceException(msg="无权访问该任务")
         return decoded
 
+    @classmethod
+    async def _get_job_data_many(
+        cls, keys: list[str], user_id: int, redis
+    ) -> dict[str, dict]:
+        """
+        批量读取任务状态哈希并校验归属。
+        未命中进程内缓存的键通过一次 pipeline 发出 HGETALL，只需一次往返。
+        不存在或不属于当前用户的任务直接忽略，不中断整批查询。
+        返回：key -> 解码后的任务字段（缓存本身，只读）。
+        """
+        now = time.monotonic()
+        found: dict[str, dict] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            cached = cls._job_cache.get(key)
+            if cached and cached[0] >= now:
+                found[key] = cached[1]
+            else:
+                missing.append(key)
+        if missing:
+            pipe = redis.pipeline()
+            for key in missing:
+                pipe.hgetall(key)
+            for key, data in zip(missing, await pipe.execute()):
+                if not data:
+                    cls._job_cache.pop(key, None)
+                    continue
+                found[key] = cls._cache_job_data(key, data, now)
+        owner = str(user_id)
+        return {
+            key: decoded
+            for key, decoded in found.items()
+            if decoded.get("user_id") == owner
+        }
+
+    @classmethod
+    def _cache_job_data(cls, key: str, decoded: dict, now: float) -> dict:
+        # 客户端以 decode_responses=True 创建，HGETALL 已返回 str 字典，无需逐字段解码
+        ttl = (
+            cls._JOB_DONE_CACHE_TTL
+            if decoded.get("status") in ("ready", "error")
+            else cls._JOB_CACHE_TTL
+        )
+        if len(cls._job_cache) >= cls._JOB_CACHE_MAX_SIZE:
+            cls._job_cache.clear()
+        cls._job_cache[key] = (now + ttl, decoded)
+        return decoded
+
     @classmethod
     async def _run_compress_job(
         cls,
@@ -2193,10 +2536,11 @@ class FileService:
         name: str | None,
         redis,
     ) -> None:
-        key = f"disk:compress:{job_id}"
+        key = cls._COMPRESS_JOB_PREFIX + job_id
         try:
-            async with async_session() as session:
-                entry = await cls.compress_by_id(session, user_id, file_id, name)
+            async with cls._archive_job_semaphore:
+                async with async_session() as session:
+                    entry = await cls.compress_by_id(session, user_id, file_id, name)
             await cls._set_job_ready(
                 key,
                 redis,
@@ -2220,10 +2564,11 @@ class FileService:
         name: str | None,
         redis,
     ) -> None:
-        key = f"disk:compress:{job_id}"
+        key = cls._COMPRESS_JOB_PREFIX + job_id
         try:
-            async with async_session() as session:
-                entry = await cls.compress_many_by_ids(session, user_id, file_ids, name)
+            async with cls._archive_job_semaphore:
+                async with async_session() as session:
+                    entry = await cls.compress_many_by_ids(session, user_id, file_ids, name)
             await cls._set_job_ready(
                 key,
                 redis,
@@ -2242,10 +2587,11 @@ class FileService:
     async def _run_extract_job(
         cls, job_id: str, user_id: int, file_id: int, redis
     ) -> None:
-        key = f"disk:extract:{job_id}"
+        key = cls._EXTRACT_JOB_PREFIX + job_id
         try:
-            async with async_session() as session:
-                entry = await cls.extract_by_id(session, user_id, file_id)
+            async with cls._archive_job_semaphore:
+                async with async_session() as session:
+                    entry = await cls.extract_by_id(session, user_id, file_id)
             await cls._set_job_ready(
                 key,
                 redis,
@@ -2260,15 +2606,48 @@ class FileService:
         except Exception as exc:
             await cls._set_job_error(key, redis, exc)
 
-    @staticmethod
-    async def _set_job_ready(key: str, redis, mapping: dict, ttl: int = 10800) -> None:
-        await redis.hset(key, mapping=mapping)
-        await redis.expire(key, ttl)
+    @classmethod
+    def _spawn(cls, coro) -> asyncio.Task:
+        """
+        启动受跟踪的后台任务。
+        任务引用保存在集合中，避免被垃圾回收提前中断。
+        完成后自动移除，未捕获的异常写入日志。
+        返回：Task。
+        """
+        task = asyncio.create_task(coro)
+        cls._background_tasks.add(task)
+        task.add_done_callback(cls._on_background_task_done)
+        return task
+
+    @classmethod
+    def _on_background_task_done(cls, task: asyncio.Task) -> None:
+        cls._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning("后台任务异常: %s", exc)
 
     @staticmethod
-    async def _set_job_error(key: str, redis, exc: Exception, ttl: int = 600) -> None:
-        await redis.hset(key, mapping={"status": "error", "error": str(exc)})
-        await redis.expire(key, ttl)
+    async def _write_job(key: str, redis, mapping: dict, ttl: int = 10800) -> None:
+        # HSET + EXPIRE 合并为一次往返
+        FileService._job_cache.pop(key, None)
+        pipe = redis.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+    @classmethod
+    async def _set_job_ready(
+        cls, key: str, redis, mapping: dict, ttl: int = 10800
+    ) -> None:
+        await cls._write_job(key, redis, mapping, ttl)
+
+    @classmethod
+    async def _set_job_error(
+        cls, key: str, redis, exc: Exception, ttl: int = 600
+    ) -> None:
+        await cls._write_job(key, redis, {"status": "error", "error": str(exc)}, ttl)
 
     @classmethod
     async def stream_zip_dir(
@@ -2300,8 +2679,10 @@ class FileService:
         cancel_flag = {"stop": False}
 
         class _FileIter:
+            # 首次读取时才打开：打开发生在工作线程中，且同一时刻只占用一个句柄
             def __init__(self, file_path: Path, should_stop):
-                self._file = file_path.open("rb")
+                self._path = file_path
+                self._file = None
                 self._stop = should_stop
 
             def __iter__(self):
@@ -2309,8 +2690,11 @@ class FileService:
 
             def __next__(self):
                 if self._stop():
-                    self._file.close()
+                    if self._file is not None:
+                        self._file.close()
                     raise StopIteration
+                if self._file is None:
+                    self._file = self._path.open("rb")
                 data = self._file.read(1024 * 1024)
                 if not data:
                     self._file.close()
@@ -2323,22 +2707,42 @@ class FileService:
         # sized=True 需要 ZIP_STORED，保证流式写入稳定。
         zf = zipstream.ZipStream(compress_type=zipstream.ZIP_STORED, sized=True)
         zf.add(b"", f"{zip_root}/")
+        file_paths = {
+            item.id: backend.resolve_abs_path(item.storage_path)
+            for item in descendants
+            if not item.is_dir
+        }
+
+        def _stat_sizes() -> dict[int, int]:
+            sizes: dict[int, int] = {}
+            for file_id, abs_path in file_paths.items():
+                try:
+                    sizes[file_id] = abs_path.stat().st_size
+                except OSError:
+                    continue
+            return sizes
+
+        # 批量 stat 放到线程中一次完成，慢盘/NFS 不阻塞事件循环。
+        sizes = await asyncio.to_thread(_stat_sizes)
         for item in descendants:
             rel = _rel_path(item)
             arcname = f"{zip_root}/{rel}" if rel else zip_root
             if item.is_dir:
                 zf.add(b"", arcname.rstrip("/") + "/")
                 continue
-            abs_path = backend.resolve_abs_path(item.storage_path)
-            try:
-                size = abs_path.stat().st_size
-            except OSError:
+            size = sizes.get(item.id)
+            if size is None:
                 continue
-            zf.add(_FileIter(abs_path, _should_stop), arcname, size=size)
+            zf.add(_FileIter(file_paths[item.id], _should_stop), arcname, size=size)
 
         async def _stream():
+            # zipstream 迭代会读文件，逐块放到线程中执行，避免阻塞事件循环
+            chunks = iter(zf)
             try:
-                for chunk in zf:
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
                     if await request.is_disconnected():
                         cancel_flag["stop"] = True
                         logger.info("客户端下载中断: %s", filename)
@@ -2575,31 +2979,38 @@ class FileService:
                         break
                     dir_paths.add(key)
 
-            for dir_path in sorted(dir_paths, key=lambda p: len(PurePosixPath(p).parts)):
+            # 同一深度的目录互不依赖，按层批量 flush 拿到 id，往返次数为目录深度而非目录数
+            levels: dict[int, list[PurePosixPath]] = {}
+            for dir_path in dir_paths:
                 rel = PurePosixPath(dir_path)
-                parent_key = rel.parent.as_posix()
-                if parent_key in (".", ""):
-                    parent_key = ""
-                parent_entry = dir_map.get(parent_key, root_dir)
-                storage_path = cls._storage_path_for(user_id, parent_entry, rel.name)
-                entry = File(
-                    user_id=user_id,
-                    parent_id=parent_entry.id,
-                    name=rel.name,
-                    is_dir=True,
-                    size=0,
-                    mime_type=None,
-                    etag=uuid4().hex,
-                    storage_id=storage.id,
-                    storage_path=storage_path,
-                    storage_path_hash=cls._hash_storage_path(storage_path),
-                    content_hash=None,
-                    is_deleted=False,
-                    deleted_at=None,
-                )
-                db.add(entry)
+                levels.setdefault(len(rel.parts), []).append(rel)
+            for depth in sorted(levels):
+                for rel in levels[depth]:
+                    parent_key = rel.parent.as_posix()
+                    if parent_key in (".", ""):
+                        parent_key = ""
+                    parent_entry = dir_map.get(parent_key, root_dir)
+                    storage_path = cls._storage_path_for(
+                        user_id, parent_entry, rel.name
+                    )
+                    entry = File(
+                        user_id=user_id,
+                        parent_id=parent_entry.id,
+                        name=rel.name,
+                        is_dir=True,
+                        size=0,
+                        mime_type=None,
+                        etag=uuid4().hex,
+                        storage_id=storage.id,
+                        storage_path=storage_path,
+                        storage_path_hash=cls._hash_storage_path(storage_path),
+                        content_hash=None,
+                        is_deleted=False,
+                        deleted_at=None,
+                    )
+                    db.add(entry)
+                    dir_map[rel.as_posix()] = entry
                 await db.flush()
-                dir_map[rel.as_posix()] = entry
 
             for item in extracted:
                 if item.is_dir:
@@ -2646,7 +3057,8 @@ class FileService:
         逻辑路径通过父链回溯得到，避免依赖存储路径。
         仅查询 DB，不扫描磁盘。
         幂等：同一删除状态返回一致结果。
-        性能：一次查询 + 若干父链查询。
+        性能：一次查询 + 若干父链查询；父节点在本次调用内按 id 缓存，
+        同一目录下的多个条目只回溯一次。
         返回：回收站条目列表结构。
         错误：数据库异常将向上抛出。
         """
@@ -2666,6 +3078,9 @@ class FileService:
         top_level_rows = [
             row for row in rows if row.parent_id is None or row.parent_id not in deleted_ids
         ]
+        nodes: dict[int, tuple[str, int | None] | None] = {
+            row.id: (row.name, row.parent_id) for row in rows
+        }
 
         async def _logical_path(row: File) -> str:
             parts = [row.name]
@@ -2675,18 +3090,23 @@ class FileService:
                 if current_id in seen:
                     break
                 seen.add(current_id)
-                parent = (
-                    await db.exec(
-                        select(File).where(
-                            File.id == current_id,
-                            File.user_id == user_id,
+                if current_id in nodes:
+                    node = nodes[current_id]
+                else:
+                    parent = (
+                        await db.exec(
+                            select(File.name, File.parent_id).where(
+                                File.id == current_id,
+                                File.user_id == user_id,
+                            )
                         )
-                    )
-                ).first()
-                if not parent:
+                    ).first()
+                    node = (parent[0], parent[1]) if parent else None
+                    nodes[current_id] = node
+                if node is None:
                     break
-                parts.append(parent.name)
-                current_id = parent.parent_id
+                parts.append(node[0])
+                current_id = node[1]
             return "/".join(reversed(parts))
 
         items = [
@@ -2803,26 +3223,66 @@ class FileService:
                     )
                 )
         files = (await db.exec(select(File).where(File.id.in_(all_ids)))).all()
-        for item in sorted(files, key=lambda f: len(f.storage_path), reverse=True):
-            storage = await cls._get_storage_by_id(db, item.storage_id)
-            backend = get_storage_backend(storage)
-            try:
-                await backend.delete(item.storage_path, item.is_dir)
-                # 清理回收站空目录，避免残留时间戳目录。
-                if item.storage_path.startswith(".trash/") and hasattr(
-                    backend, "cleanup_empty_parents"
-                ):
-                    try:
-                        trash_root = f".trash/{user_id}"
-                        backend.cleanup_empty_parents(item.storage_path, trash_root)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            try:
-                await cls._purge_thumbnail_cache_for_file(storage, item.id)
-            except Exception:
-                pass
+        storage_ids = {item.storage_id for item in files}
+        storages = {
+            storage.id: storage
+            for storage in (
+                await db.exec(select(Storage).where(Storage.id.in_(storage_ids)))
+            ).all()
+        }
+        if any(item.storage_id not in storages for item in files):
+            raise ServiceException(msg="存储配置不存在")
+
+        # 目录按 rmtree 删除，已被同存储内待删目录覆盖的子孙无需再逐个删除；
+        # 剩余路径互不包含，可并发删除
+        dir_paths = {
+            (item.storage_id, item.storage_path.rstrip("/"))
+            for item in files
+            if item.is_dir
+        }
+
+        def _covered(item: File) -> bool:
+            path = item.storage_path.rstrip("/")
+            cut = path.rfind("/")
+            while cut > 0:
+                path = path[:cut]
+                if (item.storage_id, path) in dir_paths:
+                    return True
+                cut = path.rfind("/")
+            return False
+
+        semaphore = asyncio.Semaphore(cls._PURGE_CONCURRENCY)
+        trash_root = f".trash/{user_id}"
+
+        async def _delete_one(item: File) -> None:
+            backend = get_storage_backend(storages[item.storage_id])
+            async with semaphore:
+                try:
+                    await backend.delete(item.storage_path, item.is_dir)
+                    # 清理回收站空目录，避免残留时间戳目录。
+                    if item.storage_path.startswith(".trash/") and hasattr(
+                        backend, "cleanup_empty_parents"
+                    ):
+                        try:
+                            await asyncio.to_thread(
+                                backend.cleanup_empty_parents,
+                                item.storage_path,
+                                trash_root,
+                            )
+                        except Exception:
+                            pass
+                except Exception:
+                    pass
+
+        await asyncio.gather(
+            *(_delete_one(item) for item in files if not _covered(item))
+        )
+        try:
+            await cls._purge_thumbnail_cache_for_files(
+                [(storages[item.storage_id], item.id) for item in files]
+            )
+        except Exception:
+            pass
         await db.execute(File.__table__.delete().where(File.id.in_(all_ids)))
         await db.commit()
 
@@ -374,7 +374,7 @@ class OfficeService:
             entry.mime_type = mimetypes.guess_type(entry.name or "")[0]
         await db.commit()
         await db.refresh(entry)
-        await FileService.refresh_used_space(db, uid)
+        await FileService.schedule_used_space_refresh(db, uid, redis)
         return {"etag": entry.etag}
 
     @classmethod
@@ -6,8 +6,12 @@
 @Description: 分享服务
 """
 
+import asyncio
+import json
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from pathlib import PurePosixPath
+from pathlib import Path, PurePosixPath
 import mimetypes
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -18,12 +22,33 @@ from app.modules.admin.dao.user import user_crud
 from app.modules.disk.models.file import File
 from app.modules.disk.services.file import FileService
 from app.modules.disk.storage.backends import get_storage_backend
+from app.modules.disk.storage.backends.base import StorageBackend
 from app.audit.decorator import audited
 
 
 class ShareService:
     """分享服务类"""
 
+    _RESOLVE_CACHE_TTL = 60
+    # 进程内缓存不随其它 worker 的更新失效，TTL 保持较短以限制撤销延迟。
+    _RESOLVE_LOCAL_TTL = 5
+    _RESOLVE_LOCAL_MAX_SIZE = 10_000
+    _resolve_local: dict[str, tuple[float, tuple[int, dict]]] = {}
+    _resolve_inflight: dict[str, asyncio.Future[tuple[int, dict]]] = {}
+    _share_file_local: dict[
+        str, dict[int | None, tuple[float, int, str, StorageBackend]]
+    ] = {}
+
+    @dataclass(frozen=True)
+    class ShareFile:
+        path: Path
+        id: int
+        etag: str
+        name: str
+        mime_type: str | None
+
+    _FILE_META_CACHE_TTL = 300
+
     @staticmethod
     def _audit_share_detail(share: dict | None) -> dict:
         if not share:
@@ -52,6 +77,99 @@ class ShareService:
     def share_access_key(token: str, access_token: str) -> str:
         return f"share:access:{token}:{access_token}"
 
+    @staticmethod
+    def share_resolve_key(token: str) -> str:
+        return f"share:resolved:{token}"
+
+    @staticmethod
+    def decode_resolved_cache(raw: str | None) -> tuple[int, dict] | None:
+        if not raw:
+            return None
+        try:
+            user_id, data = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        expires_at = data.get("expiresAt")
+        if expires_at and int(expires_at) <= ShareService._to_ms(ShareService._now()):
+            # 已过期交给 DB 路径落库状态并抛错。
+            return None
+        return int(user_id), data
+
+    @staticmethod
+    def get_local_resolved(token: str) -> tuple[int, dict] | None:
+        cached = ShareService._resolve_local.get(token)
+        if not cached:
+            return None
+        expires_at, (user_id, data) = cached
+        share_expires_at = data.get("expiresAt")
+        if time.monotonic() > expires_at or (
+            share_expires_at
+            and int(share_expires_at) <= ShareService._to_ms(ShareService._now())
+        ):
+            ShareService._resolve_local.pop(token, None)
+            return None
+        # 返回副本，避免调用方修改影响缓存。
+        return user_id, dict(data)
+
+    @staticmethod
+    def set_local_resolved(token: str, resolved: tuple[int, dict]) -> None:
+        local = ShareService._resolve_local
+        now = time.monotonic()
+        if len(local) >= ShareService._RESOLVE_LOCAL_MAX_SIZE:
+            for key in [key for key, (expires_at, _) in local.items() if expires_at < now]:
+                local.pop(key, None)
+            if len(local) >= ShareService._RESOLVE_LOCAL_MAX_SIZE:
+                local.clear()
+        user_id, data = resolved
+        local[token] = (now + ShareService._RESOLVE_LOCAL_TTL, (user_id, dict(data)))
+
+    @staticmethod
+    async def _set_resolved_cache(token: str, user_id: int, data: dict, redis) -> None:
+        ttl = ShareService._RESOLVE_CACHE_TTL
+        expires_at = data.get("expiresAt")
+        if expires_at:
+            remaining = (int(expires_at) - ShareService._to_ms(ShareService._now())) // 1000
+            ttl = min(ttl, remaining)
+        if ttl <= 0:
+            return
+        await redis.set(
+            ShareService.share_resolve_key(token),
+            json.dumps([user_id, data], ensure_ascii=False),
+            ex=ttl,
+        )
+
+    @staticmethod
+    async def invalidate_resolved_cache(tokens: list[str], redis) -> None:
+        for token in tokens:
+            ShareService._resolve_local.pop(token, None)
+            ShareService._share_file_local.pop(token, None)
+        if redis is None or not tokens:
+            return
+        await redis.delete(*(ShareService.share_resolve_key(token) for token in tokens))
+
+    @staticmethod
+    async def invalidate_deleted_targets(
+        user_id: int, db: AsyncSession, redis
+    ) -> None:
+        """
+        失效目标文件已删除的分享解析缓存。
+        解析缓存命中时跳过 DB 校验，文件进回收站或被覆盖后需主动清除，
+        否则分享在缓存 TTL 内仍可解析。
+        由文件删除/覆盖上传的调用方在删除后调用；目录级联软删的子孙一并覆盖。
+        返回：None。
+        """
+        stmt = (
+            select(Share.token)
+            .join(File, File.id == Share.file_id)
+            .where(
+                Share.user_id == user_id,
+                Share.is_deleted == False,
+                File.is_deleted == True,
+            )
+        )
+        tokens = list((await db.exec(stmt)).all())
+        await ShareService.invalidate_resolved_cache(tokens, redis)
+
     @staticmethod
     def _to_ms(dt: datetime) -> int:
         return int(dt.timestamp() * 1000)
@@ -89,6 +207,39 @@ class ShareService:
             return False
         return True
 
+    @staticmethod
+    async def _missing_share_ids(
+        shares: list[Share], user_id: int, db: AsyncSession
+    ) -> set[str]:
+        """
+        批量判断分享目标是否已失效（不存在、已删除或类型不符）。
+        与 _share_resource_exists 规则一致，但整页只发一次 IN 查询，避免逐条查库。
+        返回：目标失效的分享 id 集合。
+        """
+        file_ids = {share.file_id for share in shares}
+        if not file_ids:
+            return set()
+        rows = (
+            await db.exec(
+                select(File.id, File.is_dir).where(
+                    File.id.in_(file_ids),
+                    File.user_id == user_id,
+                    File.is_deleted == False,
+                )
+            )
+        ).all()
+        is_dir_by_id = {row[0]: row[1] for row in rows}
+        missing: set[str] = set()
+        for share in shares:
+            is_dir = is_dir_by_id.get(share.file_id)
+            if (
+                is_dir is None
+                or (share.resource_type == "FILE" and is_dir)
+                or (share.resource_type == "FOLDER" and not is_dir)
+            ):
+                missing.add(share.id)
+        return missing
+
     @staticmethod
     @staticmethod
     @audited(
@@ -182,10 +333,8 @@ class ShareService:
         if status == "missing":
             result_all = await db.exec(query)
             rows_all = result_all.all()
-            missing_rows = []
-            for row in rows_all:
-                if not await ShareService._share_resource_exists(row, user_id, db):
-                    missing_rows.append(row)
+            missing_ids = await ShareService._missing_share_ids(rows_all, user_id, db)
+            missing_rows = [row for row in rows_all if row.id in missing_ids]
             total = len(missing_rows)
             pages = max((total + size - 1) // size, 1) if total > 0 else 0
             rows = missing_rows[offset : offset + size]
@@ -201,10 +350,11 @@ class ShareService:
         pages = max((total + size - 1) // size, 1) if total > 0 else 0
         result = await db.exec(query.offset(offset).limit(size))
         rows = result.all()
+        missing_ids = await ShareService._missing_share_ids(rows, user_id, db)
         items = []
         for row in rows:
             item = ShareService._share_model_to_dict(row, include_code=True)
-            if not await ShareService._share_resource_exists(row, user_id, db):
+            if row.id in missing_ids:
                 item["status"] = -1
                 item["missing"] = True
             else:
@@ -213,7 +363,9 @@ class ShareService:
         return items, total, pages, size
 
     @staticmethod
-    async def revoke_share(user_id: int, share_id: str, db: AsyncSession) -> None:
+    async def revoke_share(
+        user_id: int, share_id: str, db: AsyncSession, redis=None
+    ) -> None:
         result = await db.exec(
             select(Share).where(
                 Share.user_id == user_id,
@@ -227,10 +379,11 @@ class ShareService:
         share.status = 0
         db.add(share)
         await db.commit()
+        await ShareService.invalidate_resolved_cache([share.token], redis)
 
     @staticmethod
     async def batch_update_status(
-        user_id: int, ids: list[str], status: int, db: AsyncSession
+        user_id: int, ids: list[str], status: int, db: AsyncSession, redis=None
     ) -> dict:
         if status not in (0, 1):
             raise ServiceException(msg="状态值不合法")
@@ -247,6 +400,7 @@ class ShareService:
             row.status = status
             db.add(row)
         await db.commit()
+        await ShareService.invalidate_resolved_cache([row.token for row in rows], redis)
         failed = [share_id for share_id in ids if share_id not in found_ids]
         return {"success": len(found_ids), "failed": failed}
 
@@ -259,6 +413,7 @@ class ShareService:
         code: str | None,
         status: int | None,
         db: AsyncSession,
+        redis=None,
     ) -> dict:
         result = await db.exec(
             select(Share).where(
@@ -294,6 +449,7 @@ class ShareService:
         db.add(share)
         await db.commit()
         await db.refresh(share)
+        await ShareService.invalidate_resolved_cache([share.token], redis)
         return ShareService._share_model_to_dict(share, include_code=True)
 
     @staticmethod
@@ -305,7 +461,58 @@ class ShareService:
         auto_commit=True,
     )
     async def resolve_share(
-        token: str, db: AsyncSession, commit: bool = False
+        token: str, db: AsyncSession, redis=None, commit: bool = False
+    ) -> tuple[int, dict]:
+        """
+        解析分享 token 并返回 (owner_id, share)。
+        传入 redis 时依次查进程内缓存（5 秒）、Redis（60 秒）、DB，并逐级回填；
+        Redis TTL 不超过分享剩余有效期，更新/取消/删除分享时主动失效；
+        目标文件删除或被覆盖时由 invalidate_deleted_targets 失效。
+        同一 token 并发未命中时只由一个请求查 DB，其余等待其结果。
+        返回：分享所有者 ID 与分享字典。
+        """
+        if redis is None:
+            return await ShareService._resolve_share_from_db(token, db, None, commit)
+        local = ShareService.get_local_resolved(token)
+        if local is not None:
+            return local
+        cached = ShareService.decode_resolved_cache(
+            await redis.get(ShareService.share_resolve_key(token))
+        )
+        if cached is not None:
+            ShareService.set_local_resolved(token, cached)
+            return cached
+        inflight = ShareService._resolve_inflight.get(token)
+        if inflight is not None:
+            try:
+                user_id, data = await asyncio.shield(inflight)
+                return user_id, dict(data)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+        future: asyncio.Future[tuple[int, dict]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        ShareService._resolve_inflight[token] = future
+        try:
+            resolved = await ShareService._resolve_share_from_db(
+                token, db, redis, commit
+            )
+            ShareService.set_local_resolved(token, resolved)
+            future.set_result(resolved)
+            return resolved
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            ShareService._resolve_inflight.pop(token, None)
+            if not future.done():
+                future.cancel()
+
+    @staticmethod
+    async def _resolve_share_from_db(
+        token: str, db: AsyncSession, redis, commit: bool
     ) -> tuple[int, dict]:
         result = await db.exec(select(Share).where(Share.token == token))
         share = result.first()
@@ -334,10 +541,14 @@ class ShareService:
         if owner:
             owner_name = owner.nickname or owner.username
         data["ownerName"] = owner_name
+        if redis is not None:
+            await ShareService._set_resolved_cache(token, share.user_id, data, redis)
         return share.user_id, data
 
     @staticmethod
-    async def batch_delete(user_id: int, ids: list[str], db: AsyncSession) -> dict:
+    async def batch_delete(
+        user_id: int, ids: list[str], db: AsyncSession, redis=None
+    ) -> dict:
         if not ids:
             return {"success": 0, "failed": []}
         result = await db.exec(
@@ -351,11 +562,14 @@ class ShareService:
             row.is_deleted = True
             db.add(row)
         await db.commit()
+        await ShareService.invalidate_resolved_cache([row.token for row in rows], redis)
         failed = [share_id for share_id in ids if share_id not in found_ids]
         return {"success": len(found_ids), "failed": failed}
 
     @staticmethod
-    async def delete_share(user_id: int, share_id: str, db: AsyncSession) -> None:
+    async def delete_share(
+        user_id: int, share_id: str, db: AsyncSession, redis=None
+    ) -> None:
         result = await db.exec(
             select(Share).where(
                 Share.user_id == user_id,
@@ -369,6 +583,7 @@ class ShareService:
         share.is_deleted = True
         db.add(share)
         await db.commit()
+        await ShareService.invalidate_resolved_cache([share.token], redis)
 
     @staticmethod
     async def _get_share_root_file(share: dict, user_id: int, db: AsyncSession) -> File:
@@ -401,7 +616,15 @@ class ShareService:
         user_id: int,
         db: AsyncSession,
         parent_id: int | None,
-    ) -> list[dict]:
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[list[dict], bool]:
+        """
+        分页列出分享目录下的子项。
+        offset/limit 下推到 SQL，多取一条用于判断是否还有下一页，
+        不再拉取全量后在 Python 中切片。
+        返回：(当前页条目, 是否还有更多)。
+        """
         if share.get("resourceType") != "FOLDER":
             raise ServiceException(msg="分享不是目录")
         root = await cls._get_share_root_file(share, user_id, db)
@@ -418,10 +641,16 @@ class ShareService:
                 File.parent_id == target_parent_id,
                 File.is_deleted == False,
             )
-            .order_by(File.is_dir.desc(), File.name.asc())
+            .order_by(File.is_dir.desc(), File.name.asc(), File.id.asc())
+            .offset(offset)
         )
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
         rows = (await db.exec(stmt)).all()
-        return [cls._to_entry(item) for item in rows]
+        has_more = limit is not None and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+        return [cls._to_entry(item) for item in rows], has_more
 
     @classmethod
     async def get_share_file_meta(
@@ -443,7 +672,52 @@ class ShareService:
         user_id: int,
         db: AsyncSession,
         file_id: int | None,
-    ) -> Path:
+    ) -> "ShareService.ShareFile":
+        """
+        解析分享内待下载文件的绝对路径。
+        范围校验结果（目标 ID、storage_path 与存储后端）按 (token, file_id)
+        在进程内缓存 5 秒，与分享解析缓存同步失效，
+        热门分享的连续请求跳过范围校验与存储查询。
+        目标文件行每次按主键重新读取，回收/删除/改写后 path 与 etag 立即生效，
+        元信息缓存不会沿用旧 etag；移动/重命名会改写自身及子孙的 storage_path，
+        与缓存不一致时重新做范围校验，移出分享目录的文件不再可下载。
+        错误：文件不在分享范围内或不存在时抛出 ServiceException。
+        返回：ShareFile（路径与下载所需的文件元信息）。
+        """
+        token = share.get("token") or ""
+        now = time.monotonic()
+        cached = cls._share_file_local.get(token, {}).get(file_id)
+        if cached and cached[0] >= now:
+            _, target_id, storage_path, backend = cached
+            stmt = select(File).where(
+                File.id == target_id,
+                File.user_id == user_id,
+                File.is_deleted == False,
+            )
+            target = (await db.exec(stmt)).first()
+            if target and target.storage_path == storage_path:
+                return cls._to_share_file(target, backend)
+            cls._share_file_local.get(token, {}).pop(file_id, None)
+        target, backend = await cls._resolve_share_file(share, user_id, db, file_id)
+        files = cls._share_file_local.setdefault(token, {})
+        if len(files) >= 256:
+            files.clear()
+        files[file_id] = (
+            now + cls._RESOLVE_LOCAL_TTL,
+            target.id,
+            target.storage_path,
+            backend,
+        )
+        return cls._to_share_file(target, backend)
+
+    @classmethod
+    async def _resolve_share_file(
+        cls,
+        share: dict,
+        user_id: int,
+        db: AsyncSession,
+        file_id: int | None,
+    ) -> tuple[File, StorageBackend]:
         root = await cls._get_share_root_file(share, user_id, db)
         target = root
         if share.get("resourceType") == "FOLDER":
@@ -462,8 +736,50 @@ class ShareService:
         if target.is_dir:
             raise ServiceException(msg="不能下载目录")
         storage = await FileService._get_storage_by_id(db, target.storage_id)
-        backend = get_storage_backend(storage)
-        return backend.resolve_abs_path(target.storage_path)
+        return target, get_storage_backend(storage)
+
+    @classmethod
+    def _to_share_file(
+        cls, target: File, backend: StorageBackend
+    ) -> "ShareService.ShareFile":
+        return cls.ShareFile(
+            path=backend.resolve_abs_path(target.storage_path),
+            id=target.id,
+            etag=target.etag,
+            name=target.name,
+            mime_type=target.mime_type,
+        )
+
+    @classmethod
+    async def get_file_meta_cached(
+        cls, token: str, target: "ShareService.ShareFile", redis
+    ) -> dict:
+        """
+        获取分享文件的 size/mtime/mime，用于构建下载响应。
+        缓存键带上文件 etag，内容变更后自动换键，无需显式失效。
+        未命中时 stat 一次并回填；stat 失败返回空字典，交由响应层处理。
+        返回：{"size", "mtime", "mime"} 或空字典。
+        """
+        key = f"share:filemeta:{token}:{target.id}:{target.etag}"
+        raw = await redis.get(key)
+        if raw:
+            try:
+                return json.loads(raw)
+            except (TypeError, ValueError):
+                pass
+        try:
+            stat = await asyncio.to_thread(target.path.stat)
+        except OSError:
+            return {}
+        meta = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns // 1_000_000_000,
+            "mime": target.mime_type
+            or mimetypes.guess_type(target.name)[0]
+            or "application/octet-stream",
+        }
+        await redis.set(key, json.dumps(meta), ex=cls._FILE_META_CACHE_TTL)
+        return meta
 
     @staticmethod
     async def save_share_to_user(
@@ -491,7 +807,9 @@ class ShareService:
             storage_path = FileService._storage_path_for(
                 target_user_id, parent, root.name
             )
-            await backend.ensure_dir(PurePosixPath(storage_path).parent.as_posix())
+            await asyncio.to_thread(
+                backend.ensure_dir, PurePosixPath(storage_path).parent.as_posix()
+            )
             await backend.copy_file(root.storage_path, storage_path)
             entry = File(
                 user_id=target_user_id,
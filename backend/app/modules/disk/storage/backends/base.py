@@ -9,6 +9,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import UploadFile
 
@@ -65,7 +66,9 @@ class StorageBackend:
     def ensure_upload_session(self, user_id: int, upload_id: str) -> None:
         raise NotImplementedError
 
-    def get_upload_session_state(self, user_id: int, upload_id: str) -> dict:
+    def get_upload_session_state(
+        self, user_id: int, upload_id: str, include_parts: bool = True
+    ) -> dict:
         raise NotImplementedError
 
     async def write_upload_part(
@@ -77,6 +80,15 @@ class StorageBackend:
     ) -> int:
         raise NotImplementedError
 
+    async def write_upload_part_stream(
+        self,
+        user_id: int,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+    ) -> int:
+        raise NotImplementedError
+
     async def merge_upload_parts(
         self,
         user_id: int,
@@ -86,6 +98,11 @@ class StorageBackend:
     ) -> tuple[int, str]:
         raise NotImplementedError
 
+    def restore_merged_upload(
+        self, user_id: int, upload_id: str, storage_path: str
+    ) -> None:
+        raise NotImplementedError
+
     def mark_upload_done(self, user_id: int, upload_id: str) -> None:
         raise NotImplementedError
 
@@ -6,14 +6,24 @@
 @Description: File streaming helpers for inline/download responses.
 """
 
+import asyncio
+import mimetypes
+import os
 import re
-from email.utils import formatdate
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 from urllib.parse import quote
 
 from fastapi import Request
 from starlette.background import BackgroundTask
-from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.responses import Response, StreamingResponse
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+# 小于该长度时 sendfile 的额外开销大于收益。
+_ZEROCOPY_MIN_SIZE = 64 * 1024
 
 
 def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] | None:
@@ -30,7 +40,7 @@ def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] |
     """
     if not range_header:
         return None
-    match = re.match(r"bytes=(\d*)-(\d*)", range_header)
+    match = _RANGE_RE.match(range_header)
     if not match:
         return None
     start_str, end_str = match.groups()
@@ -42,7 +52,9 @@ def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] |
     return start, end
 
 
-def stream_file_range(file_path: Path, start: int, end: int, chunk_size: int = 8192):
+def stream_file_range(
+    file_path: Path, start: int, end: int, chunk_size: int = 256 * 1024
+):
     """
     流式读取指定字节区间。
     使用 seek 定位起始位置，避免全量读取。
@@ -53,167 +65,353 @@ def stream_file_range(file_path: Path, start: int, end: int, chunk_size: int = 8
     返回：字节块迭代器。
     """
     with file_path.open("rb") as handle:
-        handle.seek(start)
-        remaining = end - start + 1
-        while remaining > 0:
-            # 固定块读取，避免一次性占用过大内存。
-            read_size = min(chunk_size, remaining)
-            data = handle.read(read_size)
-            if not data:
-                break
-            remaining -= len(data)
-            yield data
-
-
-def build_file_response(
+        yield from _read_handle_range(handle, start, end, chunk_size)
+
+
+def _read_handle_range(
+    handle: BinaryIO, start: int, end: int, chunk_size: int = 256 * 1024
+):
+    handle.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        # 固定块读取，避免一次性占用过大内存。
+        read_size = min(chunk_size, remaining)
+        data = handle.read(read_size)
+        if not data:
+            break
+        remaining -= len(data)
+        yield data
+
+
+class RangeFileResponse(StreamingResponse):
+    """
+    文件区间响应（整文件即 0 ~ size-1 区间）。
+    读取已打开的句柄，头部长度取自同一句柄的 fstat，
+    文件在缓存元信息之后被原地改写也不会与响应体不一致。
+    ASGI 服务器声明 http.response.zerocopysend 扩展且区间超过 64 KiB 时，
+    将文件句柄与偏移交给服务器 sendfile，数据不经过用户态。
+    其余情况（如 uvicorn、Python 内 TLS 终止）回退到按块读取。
+    响应结束后关闭句柄。
+    返回：200/206 文件响应。
+    """
+
+    def __init__(self, handle: BinaryIO, start: int, end: int, **kwargs) -> None:
+        self.handle = handle
+        self.start = start
+        self.end = end
+        super().__init__(_read_handle_range(handle, start, end), **kwargs)
+
+    async def __call__(self, scope, receive, send) -> None:
+        extensions = scope.get("extensions") or {}
+        count = self.end - self.start + 1
+        try:
+            if (
+                "http.response.zerocopysend" not in extensions
+                or count <= _ZEROCOPY_MIN_SIZE
+            ):
+                await super().__call__(scope, receive, send)
+                return
+            await _send_zerocopy(self, send, self.handle, self.start, count)
+        finally:
+            await asyncio.to_thread(self.handle.close)
+
+
+async def _send_zerocopy(
+    response: Response, send, handle: BinaryIO, offset: int, count: int
+) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": response.raw_headers,
+        }
+    )
+    await send(
+        {
+            "type": "http.response.zerocopysend",
+            "file": handle,
+            "offset": offset,
+            "count": count,
+            "more_body": False,
+        }
+    )
+    if response.background is not None:
+        await response.background()
+
+
+def _open_with_stat(file_path: Path) -> tuple[BinaryIO, os.stat_result]:
+    handle = file_path.open("rb")
+    try:
+        return handle, os.fstat(handle.fileno())
+    except BaseException:
+        handle.close()
+        raise
+
+
+async def _resolve_file_meta(
+    file_path: Path, size: int | None, mtime: int | None
+) -> tuple[int, int]:
+    """
+    获取响应所需的文件大小与修改时间。
+    调用方已缓存 size/mtime 时直接复用，避免每次请求 stat。
+    任一值缺失时回退到一次 stat 调用。
+    stat 在线程中执行，慢盘/NFS 不阻塞事件循环。
+    返回：(size, mtime)。
+    """
+    if size is not None and mtime is not None:
+        return int(size), int(mtime)
+    file_stat = await asyncio.to_thread(file_path.stat)
+    return file_stat.st_size, file_stat.st_mtime_ns // 1_000_000_000
+
+
+@lru_cache(maxsize=8192)
+def _http_date(mtime: int) -> str:
+    # 同一文件 mtime 不变，缓存 HTTP-date 避免每次请求重复格式化。
+    return formatdate(mtime, usegmt=True)
+
+
+@lru_cache(maxsize=8192)
+def _weak_etag(size: int, mtime: int) -> str:
+    return f'W/"{size}-{mtime}"'
+
+
+def is_not_modified(request: Request, etag: str, mtime: int) -> bool:
+    """
+    判断条件请求是否命中缓存。
+    If-None-Match 优先，存在时忽略 If-Modified-Since。
+    ETag 采用弱比较，兼容 W/ 前缀与多值列表。
+    日期无法解析时视为未命中。
+    返回：命中时为 True，调用方应返回 304。
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        target = etag.removeprefix("W/")
+        return any(
+            candidate.strip().removeprefix("W/") == target
+            for candidate in if_none_match.split(",")
+        )
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return mtime <= int(since.timestamp())
+
+
+def not_modified_response(
+    etag: str, last_modified: str, background: BackgroundTask | None
+) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Last-Modified": last_modified},
+        background=background,
+    )
+
+
+def build_head_response(
     request: Request,
-    file_path: Path,
     filename: str,
-    background: BackgroundTask | None,
+    size: int,
+    mtime: int,
+    inline: bool,
+    media_type: str,
+    background: BackgroundTask | None = None,
 ) -> Response:
+    """
+    构建 HEAD 请求的元信息响应。
+    仅依据 size/mtime 生成头部，不打开文件、不创建流生成器。
+    支持条件请求（304）与单 Range（206/416）探测。
+    返回：无响应体的 Response。
+    """
     range_header = request.headers.get("range")
-    stat = file_path.stat()
-    size = stat.st_size
-    mtime = int(stat.st_mtime)
-    last_modified = formatdate(mtime, usegmt=True)
-    etag = f'W/"{size}-{mtime}"'
+    last_modified = _http_date(mtime)
+    etag = _weak_etag(size, mtime)
+    if is_not_modified(request, etag, mtime):
+        return not_modified_response(etag, last_modified, background)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(size),
+        "Content-Encoding": "identity",
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Content-Disposition": content_disposition(filename, inline=inline),
+        "Content-Type": media_type,
+    }
     if not range_header:
-        return FileResponse(
-            file_path,
-            filename=filename,
-            background=background,
-            headers={
-                "Accept-Ranges": "bytes",
-                "Content-Length": str(size),
-                "Content-Encoding": "identity",
-                "ETag": etag,
-                "Last-Modified": last_modified,
-            },
-        )
-
+        return Response(status_code=200, headers=headers, background=background)
     parsed = parse_range_header(range_header, size)
     if not parsed:
-        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return Response(
+            status_code=416,
+            headers={"Content-Range": f"bytes */{size}"},
+            background=background,
+        )
     start, end = parsed
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return Response(status_code=206, headers=headers, background=background)
 
-    response = StreamingResponse(
-        stream_file_range(file_path, start, end),
-        status_code=206,
-        headers={
-            "Content-Range": f"bytes {start}-{end}/{size}",
-            "Accept-Ranges": "bytes",
-            "Content-Length": str(end - start + 1),
-            "Content-Disposition": content_disposition(filename, inline=False),
-            "Content-Encoding": "identity",
-            "ETag": etag,
-            "Last-Modified": last_modified,
-        },
-        media_type="application/octet-stream",
+
+
+async def build_file_response(
+    request: Request,
+    file_path: Path,
+    filename: str,
+    background: BackgroundTask | None,
+    size: int | None = None,
+    mtime: int | None = None,
+) -> Response:
+    size, mtime = await _resolve_file_meta(file_path, size, mtime)
+    last_modified = _http_date(mtime)
+    etag = _weak_etag(size, mtime)
+    if is_not_modified(request, etag, mtime):
+        return not_modified_response(etag, last_modified, background)
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    if request.method == "HEAD":
+        return build_head_response(
+            request=request,
+            filename=filename,
+            size=size,
+            mtime=mtime,
+            inline=False,
+            media_type=media_type,
+            background=background,
+        )
+    return await _build_body_response(
+        file_path=file_path,
+        range_header=request.headers.get("range"),
+        filename=filename,
+        inline=False,
+        media_type=media_type,
         background=background,
     )
-    return response
 
 
-def build_inline_response(
+async def build_inline_response(
     request: Request,
     file_path: Path,
     filename: str,
     media_type: str,
     background: BackgroundTask | None,
+    size: int | None = None,
+    mtime: int | None = None,
 ) -> Response:
-    range_header = request.headers.get("range")
-    stat = file_path.stat()
-    size = stat.st_size
-    mtime = int(stat.st_mtime)
-    last_modified = formatdate(mtime, usegmt=True)
-    etag = f'W/"{size}-{mtime}"'
+    size, mtime = await _resolve_file_meta(file_path, size, mtime)
+    last_modified = _http_date(mtime)
+    etag = _weak_etag(size, mtime)
+    if is_not_modified(request, etag, mtime):
+        return not_modified_response(etag, last_modified, background)
     if request.method == "HEAD":
-        if range_header:
-            parsed = parse_range_header(range_header, size)
-            if not parsed:
-                return Response(
-                    status_code=416, headers={"Content-Range": f"bytes */{size}"}
-                )
-            start, end = parsed
-            return Response(
-                status_code=206,
-                headers={
-                    "Content-Range": f"bytes {start}-{end}/{size}",
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(end - start + 1),
-                    "Content-Disposition": content_disposition(filename, inline=True),
-                    "Content-Encoding": "identity",
-                    "ETag": etag,
-                    "Last-Modified": last_modified,
-                    "Content-Type": media_type,
-                },
-            )
-        return Response(
-            status_code=200,
-            headers={
-                "Accept-Ranges": "bytes",
-                "Content-Length": str(size),
-                "Content-Encoding": "identity",
-                "ETag": etag,
-                "Last-Modified": last_modified,
-                "Content-Disposition": content_disposition(filename, inline=True),
-                "Content-Type": media_type,
-            },
+        return build_head_response(
+            request=request,
+            filename=filename,
+            size=size,
+            mtime=mtime,
+            inline=True,
+            media_type=media_type,
+            background=background,
         )
+    return await _build_body_response(
+        file_path=file_path,
+        range_header=request.headers.get("range"),
+        filename=filename,
+        inline=True,
+        media_type=media_type,
+        background=background,
+    )
+
 
+async def _build_body_response(
+    file_path: Path,
+    range_header: str | None,
+    filename: str,
+    inline: bool,
+    media_type: str,
+    background: BackgroundTask | None,
+) -> Response:
+    """
+    打开文件并构建带响应体的 200/206 响应。
+    调用方缓存的 size/mtime 只用于 304 与 HEAD 判断；
+    这里以打开句柄的 fstat 生成长度、ETag 与 Last-Modified，
+    避免文件被原地改写后 Content-Length 与实际发送内容不符。
+    内联音视频未带 Range 时默认只返回首个 1MB 区间。
+    返回：RangeFileResponse 或 416 响应。
+    """
+    handle, file_stat = await asyncio.to_thread(_open_with_stat, file_path)
+    size = file_stat.st_size
+    mtime = file_stat.st_mtime_ns // 1_000_000_000
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Encoding": "identity",
+        "ETag": _weak_etag(size, mtime),
+        "Last-Modified": _http_date(mtime),
+        "Content-Disposition": content_disposition(filename, inline=inline),
+    }
+    if (
+        not range_header
+        and inline
+        and media_type.startswith(("video/", "audio/"))
+        and size > 0
+    ):
+        range_header = f"bytes=0-{min(size - 1, 1024 * 1024 - 1)}"
     if not range_header:
-        if media_type.startswith(("video/", "audio/")) and size > 0:
-            end = min(size - 1, 1024 * 1024 - 1)
-            range_header = f"bytes=0-{end}"
-        else:
-            return FileResponse(
-                file_path,
-                filename=filename,
-                background=background,
-                media_type=media_type,
-                headers={
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(size),
-                    "Content-Encoding": "identity",
-                    "ETag": etag,
-                    "Last-Modified": last_modified,
-                    "Content-Disposition": content_disposition(filename, inline=True),
-                },
-            )
+        headers["Content-Length"] = str(size)
+        return RangeFileResponse(
+            handle,
+            0,
+            size - 1,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
 
     parsed = parse_range_header(range_header, size)
     if not parsed:
+        await asyncio.to_thread(handle.close)
         return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
     start, end = parsed
-
-    response = StreamingResponse(
-        stream_file_range(file_path, start, end),
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return RangeFileResponse(
+        handle,
+        start,
+        end,
         status_code=206,
-        headers={
-            "Content-Range": f"bytes {start}-{end}/{size}",
-            "Accept-Ranges": "bytes",
-            "Content-Length": str(end - start + 1),
-            "Content-Disposition": content_disposition(filename, inline=True),
-            "Content-Encoding": "identity",
-            "ETag": etag,
-            "Last-Modified": last_modified,
-        },
-        media_type=media_type,
+        headers=headers,
+        media_type=media_type if inline else "application/octet-stream",
         background=background,
     )
-    return response
 
 
+class _AsciiFallbackTable(dict):
+    """
+    str.translate 映射表：非 ASCII 与引号/反斜杠替换为下划线。
+    ASCII 预先填充为恒等映射，非 ASCII 码点直接返回下划线且不写回，
+    表大小固定，不随客户端文件名增长。
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        return _UNDERSCORE
+
+
+_UNDERSCORE = ord("_")
+_ASCII_FALLBACK_TABLE = _AsciiFallbackTable({code: code for code in range(128)})
+_ASCII_FALLBACK_TABLE[ord('"')] = _UNDERSCORE
+_ASCII_FALLBACK_TABLE[ord("\\")] = _UNDERSCORE
+
+
+@lru_cache(maxsize=2048)
 def content_disposition(filename: str, inline: bool) -> str:
     disposition = "inline" if inline else "attachment"
     try:
         filename.encode("latin-1")
         return f'{disposition}; filename="{filename}"'
     except UnicodeEncodeError:
-        fallback = "".join(
-            char if ord(char) < 128 and char not in {'"', "\\"} else "_"
-            for char in filename
-        )
+        fallback = filename.translate(_ASCII_FALLBACK_TABLE)
         quoted = quote(filename)
         return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quoted}"
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 from pathlib import Path
 from uuid import uuid4
 
@@ -110,11 +111,16 @@ class BrandingService:
 
     @staticmethod
     def _prune_history(branding_dir: Path, keep: int = 3) -> None:
-        files = [f for f in branding_dir.iterdir() if f.is_file()]
-        files.sort(key=lambda item: item.stat().st_mtime, reverse=True)
-        for stale in files[keep:]:
+        with os.scandir(branding_dir) as it:
+            files = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.is_file()
+            ]
+        files.sort(reverse=True)
+        for _, stale in files[keep:]:
             try:
-                stale.unlink(missing_ok=True)
+                os.unlink(stale)
             except OSError:
                 continue
 
@@ -18,6 +18,8 @@ class InstallStatus:
 
 class InstallStateService:
     _SENTINEL_FILE = Path.cwd() / ".installed"
+    # 安装完成后不会回退，命中一次后不再 stat 哨兵文件
+    _done_latched = False
     _phase: InstallPhase = "PENDING"
     _message: str | None = None
     _updated_at: str | None = None
@@ -28,7 +30,12 @@ class InstallStateService:
 
     @classmethod
     def is_done_fast(cls) -> bool:
-        return cls._SENTINEL_FILE.exists()
+        if cls._done_latched:
+            return True
+        if cls._SENTINEL_FILE.exists():
+            cls._done_latched = True
+            return True
+        return False
 
     @classmethod
     def mark_phase(cls, phase: InstallPhase, message: str | None = None) -> None:
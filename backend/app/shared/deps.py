@@ -6,12 +6,18 @@
 @Description: 统一依赖注入封装
 """
 
-from fastapi import Depends, Security
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import Depends, Request, Security
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.modules.admin.models.user import User
 from app.core.audit_context import AuditContext, get_audit_context, set_audit_context
 from app.modules.admin.services.auth import AuthService, check_user_permission
 
+T = TypeVar("T")
+
 
 async def require_user(
     current_user: User = Depends(AuthService.get_current_user),
@@ -32,3 +38,43 @@ async def require_user(
 def require_permissions(scopes: list[str]):
     return Security(check_user_permission, scopes=scopes)
 
+
+def json_body(model: type[T]) -> Callable[[Request], Awaitable[T]]:
+    """
+    以模块级缓存的 TypeAdapter 解析 JSON 请求体。
+    TypeAdapter 在路由定义时构建一次，请求时直接走 validate_json，
+    跳过 FastAPI 逐请求的 body 字段解析与模型分派。
+    校验失败转换为 RequestValidationError，沿用全局 422 处理。
+    返回：可用于 Depends 的依赖函数。
+    """
+    adapter = TypeAdapter(model)
+
+    async def dependency(request: Request) -> T:
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in exc.errors(include_url=False)
+                ]
+            ) from exc
+
+    return dependency
+
+
+def json_body_openapi(model: type) -> dict:
+    """
+    为 json_body 依赖补充 OpenAPI 请求体描述。
+    依赖直接读取原始 body，FastAPI 不再自动生成 requestBody，
+    需通过路由的 openapi_extra 挂回模型 schema。
+    返回：openapi_extra 字典。
+    """
+    return {
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": model.model_json_schema()}
+            },
+            "required": True,
+        }
+    }